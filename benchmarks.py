@@ -0,0 +1,263 @@
+from tictactoe import Board, Node, TranspositionTable, TrieNode, SearchStats, SolvedTable, Symmetry
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Benchmarks for the engine's hot paths and for whole games. Every benchmark is
+# timed over a number of repeats, reported as the median, 90th and 99th
+# percentile time per call, plus the peak memory of one extra call. Results can
+# be saved as a JSON baseline and later runs compared against it:
+#
+#    python benchmarks.py --save baseline.json
+#    python benchmarks.py --compare baseline.json --threshold 0.25
+#
+# --compare exits with status 1 if any median got slower than the baseline by
+# more than the threshold.
+
+BENCHMARKS = {}
+
+# Registers a benchmark. setup() builds whatever the benchmark needs and returns
+# the function to time; number is how many calls make up one timed repeat.
+def benchmark(name, number=1):
+   def register(setup):
+      BENCHMARKS[name] = (setup, number)
+      return setup
+   return register
+
+def midGameBoard():
+   return Board(3, 3).move('X', 1).move('O', 5).move('X', 9).move('O', 2)
+
+@benchmark('board.move', number=1000)
+def benchMove():
+   board = midGameBoard()
+   return lambda: board.move('X', 3)
+
+@benchmark('board.getWinner', number=1000)
+def benchGetWinner():
+   board = midGameBoard()
+   return board.getWinner
+
+@benchmark('board.asString', number=1000)
+def benchAsString():
+   board = midGameBoard()
+   return board.asString
+
+@benchmark('board.asInt', number=1000)
+def benchAsInt():
+   board = midGameBoard()
+   return board.asInt
+
+@benchmark('trie.checkMatchAndAdd', number=1000)
+def benchTrie():
+   trie = TrieNode()
+   string = "=" + midGameBoard().asString()
+   node = Node(midGameBoard(), -1, trie)
+   return lambda: trie.checkMatchAndAdd(string, node)
+
+def newRoot(board, turn, symmetric=False):
+   table = TranspositionTable(board.width, board.height, symmetric)
+   root = Node(board, turn, table)
+   table.checkMatchAndAdd(board, root)
+   return root
+
+@benchmark('node.genTree')
+def benchGenTree():
+   board = Board(3, 3).move('X', 1)
+   return lambda: newRoot(board, 1).genTree()
+
+@benchmark('node.getBestMoveIdx')
+def benchGetBestMoveIdx():
+   board = Board(3, 3).move('X', 1)
+   return lambda: newRoot(board, 1).getBestMoveIdx()
+
+# The same search with SearchStats off and on. Instrumentation should cost
+# next to nothing while it's off, so a regression in search.statsOff against
+# the baseline shows in --compare, and the gap to search.statsOn is the cost of
+# collecting.
+def searchFromCorner():
+   newRoot(Board(3, 3).move('X', 1), 1).getBestMove()
+
+@benchmark('search.statsOff')
+def benchSearchStatsOff():
+   return searchFromCorner
+
+@benchmark('search.statsOn')
+def benchSearchStatsOn():
+   def search():
+      SearchStats.start()
+      try:
+         searchFromCorner()
+      finally:
+         SearchStats.stop()
+   return search
+
+# Moves for X in each scripted game. Moves that are already taken are skipped,
+# like a player retyping at the prompt.
+SCRIPTED_GAMES = ( \
+   (5, 1, 3, 4, 8, 9, 2, 6, 7), \
+   (1, 9, 3, 2, 4, 6, 7, 8, 5), \
+   (2, 4, 6, 8, 1, 3, 7, 9, 5) \
+)
+
+# Plays the scripted games the way Game.start does with no solved table: one
+# lazily expanded symmetric tree per game, searched before each computer move
+def playTreeGames():
+   for moves in SCRIPTED_GAMES:
+      board = Board(3, 3)
+      node = None
+      for moveIdx in moves:
+         if board.getWinner() != None:
+            break
+         if board.isFilledByIdx(moveIdx):
+            continue
+         board = board.move('X', moveIdx)
+         if board.getWinner() != None:
+            break
+         node = newRoot(board, 1, True) if node == None else node.getChildNodeByBoard(board)
+         nodeReply = node.getBestMoveIdx()
+         board = board.move('O', Symmetry.mapIdx(node._board, board, nodeReply))
+         node = node.getChild(nodeReply)
+
+def playSolvedGames(solved):
+   for moves in SCRIPTED_GAMES:
+      board = Board(3, 3)
+      for moveIdx in moves:
+         if board.getWinner() != None:
+            break
+         if board.isFilledByIdx(moveIdx):
+            continue
+         board = board.move('X', moveIdx)
+         if board.getWinner() == None:
+            board = board.move('O', solved.getBestMoveIdx(board))
+
+@benchmark('game.tree')
+def benchTreeGames():
+   return playTreeGames
+
+@benchmark('game.solved', number=100)
+def benchSolvedGames():
+   solved = SolvedTable.load() or SolvedTable.solve()
+   return lambda: playSolvedGames(solved)
+
+# Startup is timed in fresh processes, since a fresh engine process per request
+# pays it every time
+def runPython(args, until=None):
+   process = subprocess.Popen([sys.executable] + args, cwd=os.path.dirname(os.path.abspath(__file__)), \
+      stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+   if until == None:
+      process.communicate()
+      return
+   output = b''
+   while until not in output:
+      chunk = process.stdout.read1(4096)
+      if not chunk:
+         raise Exception("Process exited before printing " + repr(until))
+      output += chunk
+   process.kill()
+   process.wait()
+
+@benchmark('startup.python')
+def benchStartupPython():
+   return lambda: runPython(['-c', 'pass'])
+
+@benchmark('startup.import')
+def benchStartupImport():
+   return lambda: runPython(['-c', 'import tictactoe'])
+
+# From starting the process to the first move prompt of a game
+@benchmark('startup.prompt')
+def benchStartupPrompt():
+   return lambda: runPython(['-m', 'tictactoe'], b'Enter a move')
+
+def percentile(sortedValues, fraction):
+   return sortedValues[min(len(sortedValues) - 1, int(fraction * len(sortedValues)))]
+
+def run(name, repeat):
+   setup, number = BENCHMARKS[name]
+   fn = setup()
+   times = []
+   for _ in range(repeat):
+      start = time.perf_counter()
+      for _ in range(number):
+         fn()
+      times.append((time.perf_counter() - start) / number)
+   times.sort()
+
+   tracemalloc.start()
+   fn()
+   _, peak = tracemalloc.get_traced_memory()
+   tracemalloc.stop()
+
+   return { \
+      'median': percentile(times, 0.5), \
+      'p90': percentile(times, 0.9), \
+      'p99': percentile(times, 0.99), \
+      'peakBytes': peak, \
+      'repeat': repeat, \
+      'number': number \
+   }
+
+# Returns the names of benchmarks whose median is more than threshold (a
+# fraction) slower than in the baseline
+def findRegressions(results, baseline, threshold):
+   regressions = []
+   for name, result in results.items():
+      old = baseline.get('results', {}).get(name)
+      if old != None and result['median'] > old['median'] * (1 + threshold):
+         regressions.append(name)
+   return regressions
+
+def formatTime(seconds):
+   for unit, scale in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+      if seconds * scale >= 1:
+         return '%.2f %s' % (seconds * scale, unit)
+   return '%.0f ns' % (seconds * 1e9)
+
+def main():
+   parser = argparse.ArgumentParser(description="Benchmarks for the Tic-Tac-Toe engine")
+   parser.add_argument("-k", metavar="NAME", action="append", \
+      help="only run benchmarks whose name contains NAME (can be repeated)")
+   parser.add_argument("--repeat", type=int, default=20, help="timed repeats per benchmark")
+   parser.add_argument("--save", metavar="FILE", help="save the results as a JSON baseline")
+   parser.add_argument("--compare", metavar="FILE", help="compare against a saved baseline")
+   parser.add_argument("--threshold", type=float, default=0.25, \
+      help="allowed slowdown of the median before --compare fails (default 0.25)")
+   args = parser.parse_args()
+
+   names = [name for name in BENCHMARKS if not args.k or any(k in name for k in args.k)]
+   baseline = None
+   if args.compare:
+      with open(args.compare) as f:
+         baseline = json.load(f)
+
+   results = {}
+   for name in names:
+      results[name] = result = run(name, args.repeat)
+      line = '%-24s median %10s   p90 %10s   p99 %10s   peak %8.1f KiB' % (name, \
+         formatTime(result['median']), formatTime(result['p90']), formatTime(result['p99']), \
+         result['peakBytes'] / 1024)
+      if baseline != None and name in baseline.get('results', {}):
+         line += '   %+.0f%%' % (100 * (result['median'] / baseline['results'][name]['median'] - 1))
+      print(line)
+
+   if args.save:
+      with open(args.save, 'w') as f:
+         json.dump({ \
+            'python': platform.python_version(), \
+            'platform': platform.platform(), \
+            'results': results \
+         }, f, indent=2)
+
+   if baseline != None:
+      regressions = findRegressions(results, baseline, args.threshold)
+      if regressions:
+         print('Slower than baseline by more than %.0f%%: %s' % (args.threshold * 100, ', '.join(regressions)))
+         sys.exit(1)
+
+if __name__ == "__main__":
+   main()
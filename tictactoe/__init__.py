@@ -0,0 +1,36 @@
+# Tic-Tac-Toe engine. The core classes are imported here; the ones that pull in
+# heavier modules (multiprocessing, asyncio, sqlite3) load on first use, so
+# importing the package or starting a game stays quick.
+from .board import Zobrist, Board, SearchBoard
+from .game import Game
+from .log import MyLogger
+from .search import Evaluator, MoveOrdering, CenterOrdering, KillerOrdering, HistoryOrdering, Negamax
+from .solved import SolvedTable, RetrogradeSolver
+from .stats import SearchStats
+from .symmetry import Symmetry
+from .tables import TranspositionTable, ZobristTable
+from .tree import Node, TreeStore, TreeHandle
+from .trie import TrieNode
+
+_LAZY = {
+   'PositionCache': 'cache',
+   'ParallelSearch': 'parallel',
+   'BatchAnalyzer': 'batch',
+   'GameServer': 'server',
+   'Engine': 'engine',
+   'GameLogAnalyzer': 'gamelog',
+   'PositionExporter': 'export',
+}
+
+def __getattr__(name):
+   module = _LAZY.get(name)
+   if module == None:
+      raise AttributeError("module 'tictactoe' has no attribute '" + name + "'")
+   import importlib
+   return getattr(importlib.import_module('.' + module, __name__), name)
+
+__all__ = [
+   'Zobrist', 'Board', 'SearchBoard', 'Game', 'MyLogger', 'Evaluator', 'MoveOrdering', 'CenterOrdering', \
+   'KillerOrdering', 'HistoryOrdering', 'Negamax', 'SolvedTable', 'RetrogradeSolver', 'SearchStats', 'Symmetry', \
+   'TranspositionTable', 'ZobristTable', 'Node', 'TreeStore', 'TreeHandle', 'TrieNode'
+] + list(_LAZY)
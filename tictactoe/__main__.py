@@ -0,0 +1,88 @@
+import argparse
+import sys
+
+from .solved import SolvedTable
+
+# Command line entry point, run with python -m tictactoe. Only the parts of the
+# engine needed for the chosen command get imported, so starting a game stays
+# quick.
+def main():
+   parser = argparse.ArgumentParser(prog="tictactoe", description="Command line Tic-Tac-Toe against a minimax AI")
+   parser.add_argument("-t", action="store_true", help="run the tests")
+   parser.add_argument("-s", metavar="PATH", nargs="?", const=SolvedTable.DEFAULT_PATH, \
+      help="write the solved table (to " + SolvedTable.DEFAULT_PATH + " by default)")
+   parser.add_argument("-b", metavar="FILE", nargs="?", const="-", \
+      help="score the board strings in FILE (or stdin) instead of playing")
+   parser.add_argument("-l", metavar="FILE", nargs="?", const="-", \
+      help="check the recorded games in FILE (or stdin) for mistakes")
+   parser.add_argument("--summary", action="store_true", help="only print the totals for -l")
+   parser.add_argument("-e", metavar="PATH", \
+      help="export every position with its value to .npy files in directory PATH (or a CSV file with --csv)")
+   parser.add_argument("--csv", action="store_true", help="export as CSV for -e, to stdout if PATH is -")
+   parser.add_argument("-j", metavar="WORKERS", type=int, \
+      help="number of worker processes for -b (one per core by default), --serve (one by default) or " \
+         "searching bigger boards (one by default)")
+   parser.add_argument("--cache", metavar="FILE", \
+      help="keep search results for bigger boards in FILE, shared between runs")
+   parser.add_argument("--engine", action="store_true", \
+      help="answer position/go commands on stdin, for other programs to drive")
+   parser.add_argument("--serve", metavar="ADDRESS", \
+      help="host games over a line protocol on HOST:PORT or a Unix socket path")
+   parser.add_argument("size", nargs="?", type=int, default=3, help="board width and height")
+   parser.add_argument("k", nargs="?", type=int, help="number in a row needed to win")
+   parser.add_argument("depth", nargs="?", type=int, help="how many moves ahead to search")
+   args = parser.parse_args()
+   if args.size < 1:
+      parser.error("size must be at least 1")
+   if args.k != None and not 1 <= args.k <= args.size:
+      parser.error("k must be between 1 and the size")
+   if args.depth != None and args.depth < 1:
+      parser.error("depth must be at least 1")
+
+   if args.t:
+      from .tests import test
+      test()
+   elif args.s != None:
+      from .solved import RetrogradeSolver
+      try:
+         solved = RetrogradeSolver().solve().toSolvedTable()
+      except ImportError:
+         solved = SolvedTable.solve()
+      solved.write(args.s)
+      print("Wrote solved table to " + args.s)
+   elif args.engine:
+      from .engine import Engine
+      cache = None
+      if args.cache != None:
+         from .cache import PositionCache
+         cache = PositionCache(args.cache)
+      Engine(cache=cache).run(sys.stdin, sys.stdout)
+      if cache != None:
+         cache.close()
+   elif args.serve != None:
+      from .server import GameServer
+      if args.j != None and args.j > 1:
+         GameServer.serveWorkers(args.serve, args.j)
+      else:
+         GameServer().serve(args.serve)
+   elif args.b != None:
+      from .batch import BatchAnalyzer
+      lines = sys.stdin if args.b == "-" else open(args.b)
+      BatchAnalyzer.run(lines, sys.stdout, args.j, args.k, args.depth)
+   elif args.e != None:
+      from .export import PositionExporter
+      count = PositionExporter.run(args.e, args.csv)
+      if args.e != "-":
+         print("Exported %i positions to %s" % (count, args.e))
+   elif args.l != None:
+      from .gamelog import GameLogAnalyzer
+      lines = sys.stdin if args.l == "-" else open(args.l)
+      GameLogAnalyzer().run(lines, sys.stdout, args.summary)
+   else:
+      from .game import Game
+      Game.start(args.size, args.k, args.depth, args.j, args.cache)
+
+if __name__ == "__main__":
+   main()
+
+#TODO faded numbers vs X and Os
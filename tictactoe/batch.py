@@ -0,0 +1,106 @@
+import multiprocessing
+import os
+
+from .board import Board
+from .game import Game
+from .search import Negamax
+from .solved import SolvedTable
+
+# Scores board strings in bulk, e.g. positions pulled out of logs. Each line of
+# input is a board in the asString() format and each line of output is
+#    <board>\t<score>\t<best move>\t<winner>
+# with the score from O's point of view, a best move of 0 once the game is over
+# and a winner of "-" while it isn't, or <board>\tinvalid for a line that isn't
+# a board or is a position that can't come up in a game. Boards in the solved
+# table are looked up, anything else is searched with Negamax. Lines are handed
+# out to a pool of worker processes a block at a time, so memory stays flat
+# however long the input is, and results are written in input order.
+class BatchAnalyzer:
+   # Lines per block handed to the pool
+   BLOCK_SIZE = 4096
+
+   # Per process state, set up by _initWorker
+   _solved = None
+   _k = None
+   _depth = None
+
+   # handle is from SolvedTable.share(), so every worker reads the parent's
+   # copy of the table
+   @staticmethod
+   def _initWorker(handle, k, depth):
+      BatchAnalyzer._solved = SolvedTable.attach(handle)
+      BatchAnalyzer._k = k
+      BatchAnalyzer._depth = depth
+
+   @staticmethod
+   def analyze(line):
+      string = line.strip()
+      try:
+         board = Board.fromString(string, BatchAnalyzer._k)
+      except ValueError:
+         return string + "\tinvalid"
+      if not board.isPossible():
+         return string + "\tinvalid"
+
+      winner = board.getWinner()
+      solved = BatchAnalyzer._solved
+      if winner != None:
+         score = Game.SYMBOL_TO_SCORE[winner]
+         moveIdx = 0
+      elif solved != None and solved.contains(board):
+         score = solved.getScore(board)
+         moveIdx = solved.getBestMoveIdx(board)
+      else:
+         # Like a game, bigger boards are only searched a few moves ahead
+         remaining = board.width * board.height - board.numFilled()
+         depth = BatchAnalyzer._depth
+         if depth == None:
+            depth = remaining if board.width == 3 else Game.DEFAULT_DEPTH
+         score, moveIdx = Negamax().search(board, min(depth, remaining))
+      return "%s\t%s\t%i\t%s" % (string, score, moveIdx, winner or "-")
+
+   @staticmethod
+   def _blocks(lines, blockSize):
+      block = []
+      for line in lines:
+         if line.strip():
+            block.append(line)
+            if len(block) == blockSize:
+               yield block
+               block = []
+      if block:
+         yield block
+
+   # Analyzes every line of input, writing results to out. workers=None uses
+   # one process per core, workers=1 runs everything in this process. The solved
+   # table is loaded (or built) once here and shared with the workers.
+   @staticmethod
+   def run(lines, out, workers=None, k=None, depth=None, blockSize=BLOCK_SIZE):
+      solved = SolvedTable.load() or SolvedTable.solve()
+      if workers == 1:
+         BatchAnalyzer._solved = solved
+         BatchAnalyzer._k = k
+         BatchAnalyzer._depth = depth
+         for line in lines:
+            if line.strip():
+               out.write(BatchAnalyzer.analyze(line) + "\n")
+         return
+
+      workers = workers or os.cpu_count()
+      chunkSize = max(1, blockSize // (workers * 4))
+      handle, shm = solved.share()
+      try:
+         with multiprocessing.Pool(workers, BatchAnalyzer._initWorker, (handle, k, depth)) as pool:
+            # Keep one block in flight while the previous one is written out
+            pending = None
+            for block in BatchAnalyzer._blocks(lines, blockSize):
+               result = pool.map_async(BatchAnalyzer.analyze, block, chunkSize)
+               if pending != None:
+                  out.write("\n".join(pending.get()) + "\n")
+               pending = result
+            if pending != None:
+               out.write("\n".join(pending.get()) + "\n")
+      finally:
+         if shm != None:
+            shm.close()
+            shm.unlink()
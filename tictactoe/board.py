@@ -0,0 +1,411 @@
+from math import floor
+
+# Random 64 bit keys for Zobrist hashing. A board's hash is the XOR of the key
+# for each filled square and the symbol in it, so a move (or taking one back)
+# updates it with a single XOR whatever the board size. Keys come from a fixed
+# seed (with splitmix64, so the random module isn't needed), so hashes are the
+# same in every process and every run. Each (number of squares, k) gets its
+# own keys, since the same squares have a different value when k differs.
+class Zobrist:
+   SEED = 0x7A0B
+   MASK = (1 << 64) - 1
+   # (xKeys, oKeys) per (number of squares, k), indexed by keypad index - 1
+   _keys = {}
+
+   @staticmethod
+   def getKeys(numSquares, k):
+      keys = Zobrist._keys.get((numSquares, k))
+      if keys == None:
+         state = Zobrist.SEED + (numSquares << 16) + k
+         values = []
+         for _ in range(2 * numSquares):
+            state = (state + 0x9E3779B97F4A7C15) & Zobrist.MASK
+            z = ((state ^ (state >> 30)) * 0xBF58476D1CE4E5B9) & Zobrist.MASK
+            z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & Zobrist.MASK
+            values.append(z ^ (z >> 31))
+         keys = (tuple(values[:numSquares]), tuple(values[numSquares:]))
+         Zobrist._keys[(numSquares, k)] = keys
+      return keys
+
+   @staticmethod
+   def hashMasks(xMask, oMask, keys):
+      result = 0
+      for mask, symbolKeys in ((xMask, keys[0]), (oMask, keys[1])):
+         i = 0
+         while mask:
+            if mask & 1:
+               result ^= symbolKeys[i]
+            mask >>= 1
+            i += 1
+      return result
+
+class Board:
+
+   FILLER = ' '
+   SYMBOLS = ('X', 'O')
+
+   # Bitmasks of every winning line, cached per (width, k)
+   _lineMasks = {}
+   # Indices of the lines passing through each square, cached per (width, k)
+   _squareLines = {}
+
+   # k is the number in a row needed to win, the full width by default
+   def __init__(self, width, height, k=None):
+      assert(width == height)
+      self.width = width
+      self.height = height
+      self.k = width if k == None else k
+      assert(1 <= self.k <= width)
+
+      # Bitboards, one per player. Bit (idx - 1) is set when that player
+      # holds keypad square idx.
+      self._xMask = 0
+      self._oMask = 0
+      self._lines = Board.getLineMasks(width, self.k)
+      self._squareLines = Board.getSquareLines(width, self.k)
+
+      # How many pieces each player has in each line, kept up to date on every
+      # move so the winner never needs a scan of the board
+      self._xCounts = [0] * len(self._lines)
+      self._oCounts = [0] * len(self._lines)
+      self._numFilled = 0
+      self._winner = None
+
+      # Zobrist hash of the position, also kept up to date on every move
+      self._zobristKeys = Zobrist.getKeys(width * height, self.k)
+      self._hash = 0
+
+   # Draws the board next to a key of the keypad indices, e.g. for 3x3:
+   #    |   | X      7 | 8 | 9
+   # ---|---|---    ---|---|---
+   def __str__(self):
+      cellWidth = len(str(self.width * self.height))
+      divider = "|".join(["-" * (cellWidth + 2)] * self.width)
+      lines = [""]
+      for y in range(self.height):
+         if y > 0:
+            lines.append(divider + "    " + divider)
+         cells = "|".join(" " + self.getByCoord(x, y).center(cellWidth) + " " for x in range(self.width))
+         key = "|".join(" " + str(self.coordToIdx(x, y, self.width)).rjust(cellWidth) + " " for x in range(self.width))
+         lines.append((cells + "    " + key).rstrip())
+      lines.append("")
+      return "\n".join(lines)
+
+   def __eq__(self, other):
+      return other != None and \
+         self._xMask == other._xMask and \
+         self._oMask == other._oMask
+
+   def __ne__(self, other):
+      return not self.__eq__(other)
+
+   # Cheap replacement for deepcopy, since the bitboards are plain ints
+   def _copy(self):
+      newBoard = self.__class__.__new__(self.__class__)
+      newBoard.__dict__.update(self.__dict__)
+      return newBoard
+
+   def move(self, symbol, idx):
+      newBoard = self._copy()
+      newBoard._place(symbol, idx)
+      return newBoard
+
+   # Fills a square and updates the counters of the lines through it. The
+   # counter list is copied first since copies of a board share them.
+   def _place(self, symbol, idx):
+      if symbol == 'X':
+         self._xMask |= 1 << (idx - 1)
+         self._hash ^= self._zobristKeys[0][idx - 1]
+         counts = self._xCounts = self._xCounts[:]
+      else:
+         self._oMask |= 1 << (idx - 1)
+         self._hash ^= self._zobristKeys[1][idx - 1]
+         counts = self._oCounts = self._oCounts[:]
+
+      k = self.k
+      for line in self._squareLines[idx - 1]:
+         counts[line] += 1
+         if counts[line] == k and self._winner == None:
+            self._winner = symbol
+      self._numFilled += 1
+
+   # Rebuilds the line counters after the bitboards were changed directly
+   def _recount(self):
+      self._xCounts = [bin(self._xMask & line).count('1') for line in self._lines]
+      self._oCounts = [bin(self._oMask & line).count('1') for line in self._lines]
+      self._numFilled = bin(self._xMask | self._oMask).count('1')
+      self._hash = Zobrist.hashMasks(self._xMask, self._oMask, self._zobristKeys)
+      self._winner = None
+      for i in range(len(self._lines)):
+         if self._xCounts[i] == self.k:
+            self._winner = 'X'
+            break
+         if self._oCounts[i] == self.k:
+            self._winner = 'O'
+            break
+
+   def getByIdx(self, idx):
+      bit = 1 << (idx - 1)
+      if self._xMask & bit:
+         return 'X'
+      elif self._oMask & bit:
+         return 'O'
+      return Board.FILLER
+
+   def getByCoord(self, x, y):
+      return self.getByIdx(Board.coordToIdx(x, y, self.width))
+
+   def isFilledByIdx(self, idx):
+      return (self._xMask | self._oMask) & (1 << (idx - 1)) != 0
+
+   def isFilled(self, x, y):
+      return self.isFilledByIdx(Board.coordToIdx(x, y, self.width))
+
+   def numFilled(self):
+      return self._numFilled
+
+   # Builds a board from the asString() format, e.g. "XX-O-O-XO"
+   @staticmethod
+   def fromString(string, k=None):
+      width = int(round(len(string) ** 0.5))
+      if width * width != len(string):
+         raise ValueError("Board string isn't square: " + string)
+      if k != None and not 1 <= k <= width:
+         raise ValueError("Can't need %i in a row on board string: %s" % (k, string))
+      board = Board(width, width, k)
+      for i in range(len(string)):
+         c = string[i]
+         if c in Board.SYMBOLS:
+            board._place(c, i + 1)
+         elif c != '-' and c != Board.FILLER:
+            raise ValueError("Unknown symbol " + c + " in board string: " + string)
+      return board
+
+   # Builds a board from its asInt() code
+   @staticmethod
+   def fromInt(code, width=3, k=None):
+      board = Board(width, width, k)
+      for i in range(width * width, 0, -1):
+         code, digit = divmod(code, 3)
+         if digit:
+            board._place(Board.SYMBOLS[digit - 1], i)
+      return board
+
+   # X always moves first, so it's X's turn whenever both have the same
+   # number of pieces
+   def nextSymbol(self):
+      return 'X' if bin(self._xMask).count('1') == bin(self._oMask).count('1') else 'O'
+
+   # Whether the position can come up in a game: X moves first, so has the same
+   # number of pieces as O or one more, and play stops once one side has won,
+   # so the winner made the last move and the other side has no line
+   def isPossible(self):
+      extra = bin(self._xMask).count('1') - bin(self._oMask).count('1')
+      if extra not in (0, 1):
+         return False
+      xWon = self.k in self._xCounts
+      oWon = self.k in self._oCounts
+      return not (xWon and oWon) and not (xWon and extra == 0) and not (oWon and extra == 1)
+
+   def asString(self):
+      result = ""
+      for i in range(self.width * self.height):
+         c = self.getByIdx(i + 1)
+         result += (c if c != ' ' else '-')
+      return result
+
+   def asBase3(self):
+      return "".join(str(self._digit(i)) for i in range(self.width * self.height))
+
+   # Base 3 digit of the square at bit i: 0 for empty, 1 for X, 2 for O
+   def _digit(self, i):
+      return ((self._xMask >> i) & 1) + 2 * ((self._oMask >> i) & 1)
+
+   # Zobrist hash of the position. Unlike asInt() it fits in 64 bits whatever
+   # the board size, but different positions can (rarely) share a hash.
+   def zobristKey(self):
+      return self._hash
+
+   def asInt(self):
+      return Board.masksToInt(self._xMask, self._oMask, self.width * self.height)
+
+   # Base 3 code of a pair of bitboards, square 1 being the most significant
+   # digit
+   @staticmethod
+   def masksToInt(xMask, oMask, numSquares):
+      result = 0
+      for i in range(numSquares):
+         result = result * 3 + ((xMask >> i) & 1) + 2 * ((oMask >> i) & 1)
+      return result
+
+   # Builds the masks of every run of k squares along a row, column or
+   # diagonal of a board width
+   @staticmethod
+   def getLineMasks(width, k=None):
+      k = width if k == None else k
+      lines = Board._lineMasks.get((width, k))
+      if lines == None:
+         def toMask(coords):
+            mask = 0
+            for x, y in coords:
+               mask |= 1 << (Board.coordToIdx(x, y, width) - 1)
+            return mask
+
+         lines = []
+         for y in range(width):
+            for x in range(width):
+               for dx, dy in ((1, 0), (0, 1), (1, 1), (1, -1)):
+                  endX = x + dx * (k - 1)
+                  endY = y + dy * (k - 1)
+                  if 0 <= endX < width and 0 <= endY < width:
+                     lines.append(toMask([(x + dx * i, y + dy * i) for i in range(k)]))
+         lines = tuple(lines)
+         Board._lineMasks[(width, k)] = lines
+      return lines
+
+   @staticmethod
+   def getSquareLines(width, k=None):
+      k = width if k == None else k
+      squareLines = Board._squareLines.get((width, k))
+      if squareLines == None:
+         lines = Board.getLineMasks(width, k)
+         squareLines = tuple( \
+            tuple(i for i in range(len(lines)) if lines[i] & (1 << bit)) \
+            for bit in range(width * width))
+         Board._squareLines[(width, k)] = squareLines
+      return squareLines
+
+   # If the game is over, returns the winning symbol "X" or "O"
+   # Returns "C" if a cat's game
+   def getWinner(self):
+      if self._winner != None:
+         return self._winner
+      if self._numFilled == self.width * self.height:
+         # Cat's game
+         return 'C'
+      return None
+
+   # Makes a iterator through all valid moves for this board
+   def makeMoveIter(self, symbol):
+      if self.getWinner() != None:
+         return
+      else:
+         for idx in range(1, (self.width * self.height)+1):
+            if (not self.isFilledByIdx(idx)):
+               yield self.move(symbol, idx)
+         return
+
+   # Like makeMoveIter, but yields each keypad index with its board
+   def makeMoves(self, symbol):
+      if self.getWinner() != None:
+         return
+      for idx in range(1, (self.width * self.height)+1):
+         if (not self.isFilledByIdx(idx)):
+            yield idx, self.move(symbol, idx)
+
+   # Returns single move difference between this board, and a board 1 move later
+   def diffBoard(self, otherBoard):
+      a = self.asString()
+      b = otherBoard.asString()
+
+      symbol = None
+      moveIdx = None
+      for i in range(len(a)):
+         if a[i] != b[i]:
+            if (a[i] == "-" or a[i] == " ") and \
+                  (symbol == None and moveIdx == None):
+               symbol = b[i]
+               moveIdx = i + 1
+            else:
+               raise Exception("Boards not consecutive: (" + a + ", " + b + ")")
+
+      return symbol, moveIdx
+
+   # Indices count from 1 in the bottom left like a number keypad, while
+   # coordinates count from (0, 0) in the top left
+   @staticmethod
+   def idxToX(idx, width=3):
+      return (idx - 1) % width
+
+   @staticmethod
+   def idxToY(idx, width=3):
+      # Match the indices up with the number keypad
+      return width - 1 - floor((idx - 1) / width)
+
+   @staticmethod
+   def coordToIdx(x, y, width=3):
+      return width * (width - 1 - y) + x + 1
+
+# A board that changes in place, for search loops. make() plays a move for
+# whoever's turn it is and unmake() takes back the last one, so walking a
+# branch reuses one board instead of copying it at every step. Boards to keep
+# (e.g. in a tree or table) should come from snapshot(), since this one keeps
+# changing.
+class SearchBoard(Board):
+   def __init__(self, board):
+      self.__dict__.update(board.__dict__)
+      # This board owns its counters, unlike copies made by Board.move
+      self._xCounts = board._xCounts[:]
+      self._oCounts = board._oCounts[:]
+      self._symbol = board.nextSymbol()
+      # Played squares and the winner before each, most recent last
+      self._undo = []
+
+   def nextSymbol(self):
+      return self._symbol
+
+   def make(self, idx):
+      symbol = self._symbol
+      bit = 1 << (idx - 1)
+      if symbol == 'X':
+         self._xMask |= bit
+         self._hash ^= self._zobristKeys[0][idx - 1]
+         counts = self._xCounts
+         self._symbol = 'O'
+      else:
+         self._oMask |= bit
+         self._hash ^= self._zobristKeys[1][idx - 1]
+         counts = self._oCounts
+         self._symbol = 'X'
+      self._undo.append(idx)
+      self._undo.append(self._winner)
+
+      k = self.k
+      for line in self._squareLines[idx - 1]:
+         counts[line] += 1
+         if counts[line] == k and self._winner == None:
+            self._winner = symbol
+      self._numFilled += 1
+
+   def unmake(self):
+      self._winner = self._undo.pop()
+      idx = self._undo.pop()
+      bit = 1 << (idx - 1)
+      if self._symbol == 'O':
+         self._xMask &= ~bit
+         self._hash ^= self._zobristKeys[0][idx - 1]
+         counts = self._xCounts
+         self._symbol = 'X'
+      else:
+         self._oMask &= ~bit
+         self._hash ^= self._zobristKeys[1][idx - 1]
+         counts = self._oCounts
+         self._symbol = 'O'
+
+      for line in self._squareLines[idx - 1]:
+         counts[line] -= 1
+      self._numFilled -= 1
+
+   # Returns an ordinary Board of the current position
+   def snapshot(self):
+      board = Board.__new__(Board)
+      board.__dict__.update(self.__dict__)
+      del board._symbol
+      del board._undo
+      board._xCounts = self._xCounts[:]
+      board._oCounts = self._oCounts[:]
+      return board
+
+   # Copies (from move() and the like) are ordinary boards
+   def _copy(self):
+      return self.snapshot()
@@ -0,0 +1,141 @@
+import collections
+import sqlite3
+
+# Search results kept across runs and processes: a bounded in-memory LRU in
+# front of an SQLite file. Each position (keyed by board size, k and asInt())
+# maps to its score from O's point of view, the depth it was searched to and
+# the best move. Only exact scores belong here, not alpha-beta bounds, and
+# scores from different evaluators shouldn't share a file. New results are
+# written to disk in batches; call flush() or close() to write the rest.
+# maxDiskEntries caps the file by deleting the entries written longest ago,
+# going by a write sequence number that every write of an entry renews.
+class PositionCache:
+   # Results written to disk per transaction
+   WRITE_BATCH = 1000
+   # Negamax only uses the cache for positions searched at least this deep,
+   # since shallower ones are cheaper to search again than to look up
+   MIN_DEPTH = 2
+
+   def __init__(self, path, maxEntries=100000, maxDiskEntries=None, minDepth=MIN_DEPTH):
+      self.path = path
+      self.maxEntries = maxEntries
+      self.maxDiskEntries = maxDiskEntries
+      self.minDepth = minDepth
+      self._memory = collections.OrderedDict()
+      # Results not written to disk yet, which may have left memory already
+      self._pending = {}
+      self.memoryHits = 0
+      self.diskHits = 0
+      self.misses = 0
+      self.evictions = 0
+      self.diskEvictions = 0
+
+      # Several processes can share the file
+      self._db = sqlite3.connect(path, timeout=30)
+      self._db.execute("PRAGMA journal_mode=WAL")
+      self._db.execute("CREATE TABLE IF NOT EXISTS positions (" \
+         "width INTEGER, k INTEGER, code TEXT, score REAL, depth INTEGER, move INTEGER, written INTEGER, " \
+         "PRIMARY KEY (width, k, code))")
+      # Files from before the write sequence start it at 0
+      columns = [row[1] for row in self._db.execute("PRAGMA table_info(positions)")]
+      if 'written' not in columns:
+         self._db.execute("ALTER TABLE positions ADD COLUMN written INTEGER DEFAULT 0")
+      self._db.execute("CREATE INDEX IF NOT EXISTS positionsWritten ON positions (written)")
+      self._db.commit()
+
+   def __enter__(self):
+      return self
+
+   def __exit__(self, *args):
+      self.close()
+
+   def __len__(self):
+      self.flush()
+      return self._db.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+
+   @staticmethod
+   def _key(board):
+      return (board.width, board.k, board.asInt())
+
+   # Full depth searches are stored with the number of empty squares as depth
+   @staticmethod
+   def _depth(board, depth):
+      remaining = board.width * board.height - board.numFilled()
+      return remaining if depth == None else min(depth, remaining)
+
+   def _remember(self, key, entry):
+      self._memory[key] = entry
+      self._memory.move_to_end(key)
+      if len(self._memory) > self.maxEntries:
+         self._memory.popitem(last=False)
+         self.evictions += 1
+
+   # Returns (score, depth, moveIdx) for the board if it was searched at least
+   # depth moves deep (None for to the end of the game), otherwise None
+   def get(self, board, depth=None):
+      key = PositionCache._key(board)
+      depth = PositionCache._depth(board, depth)
+      entry = self._memory.get(key)
+      if entry != None:
+         self._memory.move_to_end(key)
+         if entry[1] >= depth:
+            self.memoryHits += 1
+            return entry
+      elif key in self._pending:
+         entry = self._pending[key]
+         self._remember(key, entry)
+         if entry[1] >= depth:
+            self.memoryHits += 1
+            return entry
+      else:
+         row = self._db.execute("SELECT score, depth, move FROM positions WHERE width=? AND k=? AND code=?", \
+            (key[0], key[1], str(key[2]))).fetchone()
+         if row != None:
+            entry = tuple(row)
+            self._remember(key, entry)
+            if entry[1] >= depth:
+               self.diskHits += 1
+               return entry
+      self.misses += 1
+      return None
+
+   def put(self, board, score, depth, moveIdx):
+      key = PositionCache._key(board)
+      entry = (score, PositionCache._depth(board, depth), moveIdx)
+      old = self._memory.get(key) or self._pending.get(key)
+      if old != None and old[1] > entry[1]:
+         return
+      self._remember(key, entry)
+      self._pending[key] = entry
+      if len(self._pending) >= PositionCache.WRITE_BATCH:
+         self.flush()
+
+   def flush(self):
+      if not self._pending:
+         return
+      with self._db:
+         # Keep whichever result was searched deeper. Each row gets the next
+         # write sequence number, also when it replaces an older one, which
+         # keeps its rowid.
+         self._db.executemany("INSERT INTO positions (width, k, code, score, depth, move, written) " \
+            "VALUES (?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(written), 0) + 1 FROM positions)) " \
+            "ON CONFLICT (width, k, code) DO UPDATE SET score=excluded.score, depth=excluded.depth, " \
+            "move=excluded.move, written=excluded.written WHERE excluded.depth >= positions.depth", \
+            [(key[0], key[1], str(key[2])) + entry for key, entry in self._pending.items()])
+         self._pending = {}
+         if self.maxDiskEntries != None:
+            excess = self._db.execute("SELECT COUNT(*) FROM positions").fetchone()[0] - self.maxDiskEntries
+            if excess > 0:
+               self._db.execute("DELETE FROM positions WHERE rowid IN " \
+                  "(SELECT rowid FROM positions ORDER BY written LIMIT ?)", (excess,))
+               self.diskEvictions += excess
+
+   def close(self):
+      if self._db != None:
+         self.flush()
+         self._db.close()
+         self._db = None
+
+   def stats(self):
+      return {'memoryEntries': len(self._memory), 'memoryHits': self.memoryHits, 'diskHits': self.diskHits, \
+         'misses': self.misses, 'evictions': self.evictions, 'diskEvictions': self.diskEvictions}
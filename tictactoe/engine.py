@@ -0,0 +1,150 @@
+import json
+import time
+
+from .board import Board
+from .game import Game
+from .search import Negamax
+from .solved import SolvedTable
+from .tables import ZobristTable
+
+# Headless engine for other programs to drive over stdin/stdout, in the spirit
+# of UCI. The solved table and the search's transposition table are set up
+# once and reused by every query, so a long-lived engine process answers each
+# one without rebuilding anything. Scores are from O's point of view, like the
+# rest of the game. Commands and replies, one per line:
+#    position <board> [k]   ->  ok               board in asString() format
+#    go                     ->  bestmove <idx> score <score> depth <d> nodes <n>
+#    go depth <n>               searches n (at least 1) moves ahead
+#    go movetime <ms>           searches deeper and deeper until the time is up
+#    isready                ->  readyok
+#    stats                  ->  stats <json>
+#    quit                       exits
+# Without a depth or time, 3x3 is searched to the end (straight from the
+# solved table) and bigger boards Game.DEFAULT_DEPTH moves ahead. bestmove is
+# 0 once the game is over. Anything invalid gets "error <reason>".
+class Engine:
+   def __init__(self, solved=None, cache=None):
+      if solved == None:
+         solved = SolvedTable.load() or SolvedTable.solve()
+      self._solved = solved
+      self._search = Negamax(table=ZobristTable(), cache=cache)
+      self._board = Board(3, 3)
+      self.queries = 0
+      self.solvedHits = 0
+      self.searches = 0
+      self.nodes = 0
+      self.searchSeconds = 0.0
+
+   def stats(self):
+      return { \
+         'queries': self.queries, \
+         'solvedHits': self.solvedHits, \
+         'searches': self.searches, \
+         'nodes': self.nodes, \
+         'searchSeconds': self.searchSeconds, \
+         'table': self._search.table.stats() \
+      }
+
+   # Runs one command. Returns the reply line, or None for quit.
+   def command(self, line):
+      parts = line.split()
+      if not parts:
+         return "error empty command"
+
+      cmd = parts[0].lower()
+      if cmd == "position":
+         return self._position(parts[1:])
+      elif cmd == "go":
+         return self._go(parts[1:])
+      elif cmd == "isready":
+         return "readyok"
+      elif cmd == "stats":
+         return "stats " + json.dumps(self.stats())
+      elif cmd == "quit":
+         return None
+      return "error unknown command " + cmd
+
+   def _position(self, args):
+      if len(args) not in (1, 2) or (len(args) == 2 and not args[1].isdigit()):
+         return "error usage: position <board> [k]"
+      try:
+         board = Board.fromString(args[0], int(args[1]) if len(args) == 2 else None)
+      except (ValueError, AssertionError):
+         return "error bad board " + args[0]
+      # X moves first
+      if bin(board._xMask).count('1') - bin(board._oMask).count('1') not in (0, 1):
+         return "error impossible position " + args[0]
+      self._board = board
+      return "ok"
+
+   def _go(self, args):
+      depth = None
+      movetime = None
+      if len(args) == 2 and args[0] == "depth" and args[1].isdigit() and int(args[1]) >= 1:
+         depth = int(args[1])
+      elif len(args) == 2 and args[0] == "movetime" and args[1].isdigit():
+         movetime = int(args[1]) / 1000
+      elif args:
+         return "error usage: go [depth <n> | movetime <ms>]"
+
+      self.queries += 1
+      board = self._board
+      winner = board.getWinner()
+      if winner != None:
+         return Engine._reply(Game.SYMBOL_TO_SCORE[winner], 0, 0, 0)
+      remaining = board.width * board.height - board.numFilled()
+      if depth == None and movetime == None:
+         if self._solved.contains(board):
+            self.solvedHits += 1
+            return Engine._reply(self._solved.getScore(board), self._solved.getBestMoveIdx(board), remaining, 0)
+         depth = remaining if board.width == 3 else Game.DEFAULT_DEPTH
+
+      start = time.perf_counter()
+      if movetime == None:
+         score, moveIdx, depth, nodes = self._searchDepth(board, min(depth, remaining))
+      else:
+         score, moveIdx, depth, nodes = self._searchTime(board, movetime, remaining)
+      self.searchSeconds += time.perf_counter() - start
+      return Engine._reply(score, moveIdx, depth, nodes)
+
+   def _searchDepth(self, board, depth):
+      score, moveIdx = self._search.search(board, depth)
+      self.searches += 1
+      self.nodes += self._search.nodes
+      return score, moveIdx, depth, self._search.nodes
+
+   # Iterative deepening. Each search fills the transposition table, which
+   # orders the moves of the next one. A search is only started if it should
+   # finish in time, judging by how much longer each depth took than the one
+   # before.
+   def _searchTime(self, board, seconds, remaining):
+      start = time.perf_counter()
+      nodes = 0
+      lastSeconds = None
+      growth = 2.0
+      depth = 1
+      while True:
+         iterationStart = time.perf_counter()
+         score, moveIdx, _, iterationNodes = self._searchDepth(board, depth)
+         nodes += iterationNodes
+         iterationSeconds = time.perf_counter() - iterationStart
+         if lastSeconds:
+            growth = max(2.0, iterationSeconds / lastSeconds)
+         lastSeconds = iterationSeconds
+         elapsed = time.perf_counter() - start
+         if depth >= remaining or elapsed + iterationSeconds * growth > seconds:
+            return score, moveIdx, depth, nodes
+         depth += 1
+
+   @staticmethod
+   def _reply(score, moveIdx, depth, nodes):
+      return "bestmove %i score %s depth %i nodes %i" % (moveIdx, score, depth, nodes)
+
+   # Answers commands from inp until quit or end of input
+   def run(self, inp, out):
+      for line in inp:
+         reply = self.command(line)
+         if reply == None:
+            break
+         out.write(reply + "\n")
+         out.flush()
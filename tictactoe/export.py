@@ -0,0 +1,134 @@
+import array
+import os
+import sys
+
+from .game import Game
+from .solved import SolvedTable
+
+# Writes every reachable position with its solved value as a dataset, for
+# analytics and training jobs. Each position is one row of
+#    code      Board.asInt() of the position
+#    toMove    -1 if X is to move, 1 if O is (scored like Game.SYMBOL_TO_SCORE)
+#    value     minimax score, from O's point of view
+#    bestMove  best keypad index, 0 once the game is over
+#    depth     moves until the game ends when both sides keep playing bestMove
+# in code order. Rows are produced by a generator over the codes of the solved
+# table, so no boards or Nodes are made, and written a block at a time to one
+# .npy file per column (which np.load(path, mmap_mode='r') can map without
+# reading) or to a CSV file. The .npy files are written directly, so NumPy
+# isn't needed to make them.
+class PositionExporter:
+   COLUMNS = ('code', 'toMove', 'value', 'bestMove', 'depth')
+   # array typecode and .npy descr of each column
+   TYPES = (('I', '<u4'), ('b', '|i1'), ('b', '|i1'), ('B', '|u1'), ('B', '|u1'))
+   # Rows buffered per column before writing
+   BLOCK_SIZE = 65536
+   # Room for the .npy header, so it can be written again once the number of
+   # rows is known
+   HEADER_SIZE = 128
+
+   # Base 3 digits of a code, square 1 first
+   @staticmethod
+   def _digits(code, numSquares):
+      digits = [0] * numSquares
+      for i in range(numSquares - 1, -1, -1):
+         code, digits[i] = divmod(code, 3)
+      return digits
+
+   # Moves until the end of the game for every reachable code, following the
+   # solved table's best moves, worked out backwards from the last codes.
+   # Making a move adds to the code, so every position after a move is done
+   # before the one it came from.
+   @staticmethod
+   def distancesToEnd(solved):
+      numSquares = solved.width * solved.width
+      powers = [3 ** (numSquares - idx) for idx in range(1, numSquares + 1)]
+      getByCode = solved.getByCode
+      distances = bytearray(3 ** numSquares)
+      for code in range(len(distances) - 1, -1, -1):
+         entry = getByCode(code)
+         if entry == None or entry[1] == 0:
+            continue
+         digits = PositionExporter._digits(code, numSquares)
+         digit = 1 if digits.count(1) == digits.count(2) else 2
+         distances[code] = distances[code + digit * powers[entry[1] - 1]] + 1
+      return distances
+
+   # (code, toMove, value, bestMove, depth) for every reachable position
+   @staticmethod
+   def positions(solved):
+      numSquares = solved.width * solved.width
+      getByCode = solved.getByCode
+      distances = PositionExporter.distancesToEnd(solved)
+      for code in range(3 ** numSquares):
+         entry = getByCode(code)
+         if entry != None:
+            digits = PositionExporter._digits(code, numSquares)
+            toMove = Game.SYMBOL_TO_SCORE['X' if digits.count(1) == digits.count(2) else 'O']
+            yield code, toMove, entry[0], entry[1], distances[code]
+
+   @staticmethod
+   def _npyHeader(descr, rows):
+      header = "{'descr': '%s', 'fortran_order': False, 'shape': (%i,), }" % (descr, rows)
+      header = header.ljust(PositionExporter.HEADER_SIZE - 11) + "\n"
+      return b"\x93NUMPY\x01\x00" + (len(header)).to_bytes(2, 'little') + header.encode('latin1')
+
+   # Writes rows to <directory>/<column>.npy. Returns the number of rows.
+   @staticmethod
+   def writeNpy(rows, directory, blockSize=BLOCK_SIZE):
+      os.makedirs(directory, exist_ok=True)
+      types = PositionExporter.TYPES
+      files = [open(os.path.join(directory, name + '.npy'), 'wb') for name in PositionExporter.COLUMNS]
+      try:
+         for f, (_, descr) in zip(files, types):
+            f.write(PositionExporter._npyHeader(descr, 0))
+
+         def flush(columns):
+            for f, column in zip(files, columns):
+               if sys.byteorder == 'big':
+                  column.byteswap()
+               column.tofile(f)
+
+         count = 0
+         columns = [array.array(typecode) for typecode, _ in types]
+         for row in rows:
+            for column, value in zip(columns, row):
+               column.append(value)
+            count += 1
+            if count % blockSize == 0:
+               flush(columns)
+               columns = [array.array(typecode) for typecode, _ in types]
+         flush(columns)
+
+         for f, (_, descr) in zip(files, types):
+            f.seek(0)
+            f.write(PositionExporter._npyHeader(descr, count))
+      finally:
+         for f in files:
+            f.close()
+      return count
+
+   # Writes rows to out as CSV with a header line. Returns the number of rows.
+   @staticmethod
+   def writeCsv(rows, out):
+      out.write(",".join(PositionExporter.COLUMNS) + "\n")
+      count = 0
+      for row in rows:
+         out.write("%i,%i,%i,%i,%i\n" % row)
+         count += 1
+      return count
+
+   # Exports the solved table (loaded or built if not given) to a directory of
+   # .npy files, or a CSV file if csv is set ("-" for out). Returns the number
+   # of rows.
+   @staticmethod
+   def run(path, csv=False, solved=None, out=None):
+      if solved == None:
+         solved = SolvedTable.load() or SolvedTable.solve()
+      rows = PositionExporter.positions(solved)
+      if not csv:
+         return PositionExporter.writeNpy(rows, path)
+      if path == "-":
+         return PositionExporter.writeCsv(rows, out or sys.stdout)
+      with open(path, 'w') as f:
+         return PositionExporter.writeCsv(rows, f)
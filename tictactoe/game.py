@@ -0,0 +1,136 @@
+# The rest of the engine refers to Game for its score constants, so the engine
+# modules are only imported when a game starts
+class Game:
+   MAX_SCORE = 1
+   MIN_SCORE = -1
+   CAT_SCORE = 0
+
+   SCORE_TO_SYMBOL = { \
+      MIN_SCORE:'X', \
+      MAX_SCORE:'O', \
+      CAT_SCORE:'C'
+   }
+
+   SYMBOL_TO_SCORE = { \
+      'X': MIN_SCORE, \
+      'O': MAX_SCORE, \
+      'C': CAT_SCORE \
+   }
+
+   SYMBOL_TO_WIN_MESSAGE = { \
+      "X": "You Win!", \
+      "O": "The Computer Wins!", \
+      "C": "Cat's Game! =^.^=" \
+   }
+
+   # How many moves ahead to search on boards too big to search to the end
+   DEFAULT_DEPTH = 3
+
+   def checkWinner(b):
+      winner = b.getWinner()
+      if winner != None:
+         print(b)
+         print(Game.SYMBOL_TO_WIN_MESSAGE[winner] + "\n")
+         exit(0)
+
+   # Plays on a size x size board, needing k in a row to win. Only 3x3 is
+   # searched to the end by default, bigger boards look depth moves ahead,
+   # split over that many worker processes if workers is more than 1, keeping
+   # results in a PositionCache at cachePath if one is given.
+   def start(size=3, k=None, depth=None, workers=None, cachePath=None):
+      from .board import Board
+      from .log import MyLogger
+      from .search import Negamax
+      from .solved import SolvedTable
+      from .symmetry import Symmetry
+      from .tables import TranspositionTable, ZobristTable
+      from .tree import Node
+
+      size = int(size)
+      k = size if k == None else int(k)
+      if depth != None:
+         depth = int(depth)
+      elif size > 3:
+         depth = Game.DEFAULT_DEPTH
+
+      print("\nWelcome to Tic-Tac-Toe World")
+      print("Where your wildest Tic-Tac-Toe-related dreams")
+      print("are just a minimax search away! (It's true.)")
+
+      currBoard = Board(size, size, k)
+      # Searches for boards too big to search to the end. The table is kept
+      # between moves.
+      search = None
+      if depth != None and workers != None and workers > 1:
+         from .parallel import ParallelSearch
+         search = ParallelSearch(workers, tableBits=ZobristTable.DEFAULT_BITS, cachePath=cachePath)
+      elif depth != None:
+         cache = None
+         if cachePath != None:
+            from .cache import PositionCache
+            cache = PositionCache(cachePath)
+         search = Negamax(table=ZobristTable(), cache=cache)
+      numSquares = size * size
+      firstTurn = True
+
+      # Answer straight from the solved table if one has been generated
+      solved = None
+      if size == 3 and k == 3 and depth == None:
+         solved = SolvedTable.load()
+
+      while (True):
+
+         moveIdx = ""
+         while (not moveIdx.isdigit() or \
+               int(moveIdx) < 1 or \
+               int(moveIdx) > numSquares or \
+               currBoard.isFilledByIdx(int(moveIdx))):
+
+            print(currBoard)
+            moveIdx = input("Enter a move (1-" + str(numSquares) + "): ")
+
+         moveIdx = int(moveIdx)
+         currBoard = currBoard.move('X', moveIdx)
+         Game.checkWinner(currBoard)
+
+         if solved != None:
+            moveIdx = solved.getBestMoveIdx(currBoard)
+            currBoard = currBoard.move('O', moveIdx)
+            Game.checkWinner(currBoard)
+            continue
+
+         # Boards too big to search to the end don't keep a tree between moves
+         if depth != None:
+            print("Searching for best move...")
+            _, moveIdx = search.search(currBoard, depth)
+            currBoard = currBoard.move('O', moveIdx)
+            Game.checkWinner(currBoard)
+            continue
+
+         if firstTurn:
+            firstTurn = False
+
+            MyLogger.debug('Setting up trees')
+            table = TranspositionTable(currBoard.width, currBoard.height, symmetric=True)
+            root = Node(currBoard, 1, table)
+            table.checkMatchAndAdd(currBoard, root)
+            currNode = root
+
+         else:
+            currNode = currNode.getChildNodeByBoard(currBoard)
+
+         MyLogger.debug("Current board is %s, looking for best move...", currNode._board.asString())
+
+         print("Searching for best move...")
+
+         # The node's board may be a rotation/reflection of the real one
+         nodeMoveIdx = currNode.getBestMoveIdx()
+         moveIdx = Symmetry.mapIdx(currNode._board, currBoard, nodeMoveIdx)
+         MyLogger.debug("Best move found: %i", moveIdx)
+
+         MyLogger.debug("Board before move: %s", currBoard.asString())
+         currBoard = currBoard.move('O', moveIdx)
+         MyLogger.debug("Board after move: %s", currBoard.asString())
+
+         Game.checkWinner(currBoard)
+         currNode = currNode.getChild(nodeMoveIdx)
@@ -0,0 +1,142 @@
+import json
+
+from .game import Game
+from .solved import SolvedTable
+
+# Checks recorded 3x3 games against the solved table, e.g. logs of games played
+# on the server. Each line of input is one game as keypad indices in the order
+# they were played, X first: "5 1 9 3", "5,1,9,3" or "5193". Blank lines and
+# lines starting with # are skipped. Each line of output is
+#    <line number>\t<moves>\t<result>\t<mistakes>
+# with a result of X, O or C for a finished game, "-" for one that stopped
+# early and "invalid <reason>" for one that couldn't be replayed. A mistake is a
+# move that gave away part of the solved value of the position:
+#    <ply>:<symbol>:<idx>:<kind>:<best move>
+# with a kind of win-draw, win-loss or draw-loss, or "-" for none. The totals
+# are written as a final "# summary <json>" line.
+# Games are replayed on the base 3 code of the position alone, the same code as
+# Board.asInt() and the table index, so no boards or Nodes are made and memory
+# stays flat however long the input is.
+class GameLogAnalyzer:
+   WIDTH = 3
+   NUM_SQUARES = WIDTH * WIDTH
+   # What each square adds to the code for X and O. Square 1 is the most
+   # significant digit.
+   X_DIGITS = [0] + [3 ** power for power in range(NUM_SQUARES - 1, -1, -1)]
+   O_DIGITS = [2 * digit for digit in X_DIGITS]
+   # Mistake kinds by the mover's value before and after the move
+   KINDS = {(1, 0): 'win-draw', (1, -1): 'win-loss', (0, -1): 'draw-loss'}
+   SCORE_TO_RESULT = {-1: 'X', 0: 'C', 1: 'O'}
+
+   def __init__(self, solved=None):
+      if solved == None:
+         solved = SolvedTable.load() or SolvedTable.solve()
+      self._solved = solved
+
+   # Keypad indices from one line of a log. A single run of digits is one move
+   # per digit.
+   @staticmethod
+   def parseMoves(line):
+      parts = line.replace(',', ' ').split()
+      if len(parts) == 1 and len(parts[0]) > 1:
+         parts = list(parts[0])
+      if not all(part.isdigit() for part in parts):
+         raise ValueError("not keypad indices: " + line.strip())
+      return [int(part) for part in parts]
+
+   # Replays one game. Returns (result, mistakes) with mistakes a list of
+   # (ply, symbol, idx, kind, best move) tuples, or raises ValueError if a move
+   # is off the board, on a filled square or after the game is over.
+   def replay(self, moves):
+      getByCode = self._solved.getByCode
+      code = 0
+      filled = 0
+      score, best = getByCode(code)
+      mistakes = []
+      for ply, idx in enumerate(moves):
+         if best == 0:
+            raise ValueError("move %i after the game is over" % (ply + 1))
+         if idx < 1 or idx > GameLogAnalyzer.NUM_SQUARES:
+            raise ValueError("move %i is off the board" % (ply + 1))
+         bit = 1 << idx
+         if filled & bit:
+            raise ValueError("move %i is on a filled square" % (ply + 1))
+         filled |= bit
+
+         if ply % 2 == 0:
+            symbol = 'X'
+            code += GameLogAnalyzer.X_DIGITS[idx]
+         else:
+            symbol = 'O'
+            code += GameLogAnalyzer.O_DIGITS[idx]
+         color = Game.SYMBOL_TO_SCORE[symbol]
+         before = score * color
+         bestIdx = best
+         score, best = getByCode(code)
+         kind = GameLogAnalyzer.KINDS.get((before, score * color))
+         if kind != None:
+            mistakes.append((ply + 1, symbol, idx, kind, bestIdx))
+
+      result = GameLogAnalyzer.SCORE_TO_RESULT[score] if best == 0 else None
+      return result, mistakes
+
+   @staticmethod
+   def formatGame(lineNumber, moves, result, mistakes):
+      mistakeStrings = ["%i:%s:%i:%s:%i" % mistake for mistake in mistakes]
+      return "%i\t%s\t%s\t%s" % (lineNumber, ",".join(map(str, moves)), result or "-", \
+         ",".join(mistakeStrings) or "-")
+
+   # (line number, line) for each game in the input
+   @staticmethod
+   def games(lines):
+      for lineNumber, line in enumerate(lines, 1):
+         stripped = line.strip()
+         if stripped and not stripped.startswith('#'):
+            yield lineNumber, stripped
+
+   @staticmethod
+   def newSummary():
+      return { \
+         'games': 0, 'invalid': 0, 'unfinished': 0, 'xWins': 0, 'oWins': 0, 'draws': 0, 'moves': 0, \
+         'mistakes': {kind: {'X': 0, 'O': 0} for kind in GameLogAnalyzer.KINDS.values()}, \
+         'gamesWithMistakes': 0 \
+      }
+
+   @staticmethod
+   def addGame(summary, result, mistakes, numMoves):
+      summary['games'] += 1
+      if mistakes == None:
+         summary['invalid'] += 1
+         return
+      summary['moves'] += numMoves
+      if result == None:
+         summary['unfinished'] += 1
+      elif result == 'X':
+         summary['xWins'] += 1
+      elif result == 'O':
+         summary['oWins'] += 1
+      else:
+         summary['draws'] += 1
+      for _, symbol, _, kind, _ in mistakes:
+         summary['mistakes'][kind][symbol] += 1
+      if mistakes:
+         summary['gamesWithMistakes'] += 1
+
+   # Analyzes every game in lines, writing a line per game (unless summaryOnly)
+   # and then the summary to out. Returns the summary.
+   def run(self, lines, out, summaryOnly=False):
+      summary = GameLogAnalyzer.newSummary()
+      for lineNumber, line in GameLogAnalyzer.games(lines):
+         try:
+            moves = GameLogAnalyzer.parseMoves(line)
+            result, mistakes = self.replay(moves)
+         except ValueError as e:
+            GameLogAnalyzer.addGame(summary, None, None, 0)
+            if not summaryOnly:
+               out.write("%i\t%s\tinvalid %s\t-\n" % (lineNumber, line, e))
+            continue
+         GameLogAnalyzer.addGame(summary, result, mistakes, len(moves))
+         if not summaryOnly:
+            out.write(GameLogAnalyzer.formatGame(lineNumber, moves, result, mistakes) + "\n")
+      out.write("# summary " + json.dumps(summary) + "\n")
+      return summary
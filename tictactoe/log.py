@@ -0,0 +1,43 @@
+import sys
+
+# Number of frames on the call stack, for indenting debug output by call depth.
+# Walking the frames is much cheaper than inspect.stack(), which reads the
+# source of every frame.
+def stackDepth():
+   depth = 0
+   frame = sys._getframe(1)
+   while frame is not None:
+      depth += 1
+      frame = frame.f_back
+   return depth
+
+class MyLogger:
+   baseline = stackDepth()
+   # Set up on the first message, so importing the engine doesn't load logging
+   log = None
+   active = False
+
+   @classmethod
+   def getLog(cls):
+      if MyLogger.log == None:
+         import logging
+         logging.basicConfig()
+         MyLogger.log = logging.getLogger('tictactoe')
+         MyLogger.log.setLevel(logging.DEBUG)
+      return MyLogger.log
+
+   @classmethod
+   def debug(cls, msg, *args):
+      if MyLogger.active:
+         indent = stackDepth() - MyLogger.baseline
+         logArgs = ['|' * indent + str(msg)]
+         logArgs.extend(args)
+         MyLogger.getLog().debug(*logArgs)
+
+   @classmethod
+   def on(cls):
+      MyLogger.active = True
+
+   @classmethod
+   def off(cls):
+      MyLogger.active = False
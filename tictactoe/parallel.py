@@ -0,0 +1,133 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import time
+
+from .cache import PositionCache
+from .game import Game
+from .search import Negamax
+from .stats import SearchStats
+from .tables import ZobristTable
+
+# Negamax split at the root across worker processes. The first move in
+# Negamax's order is searched here before anything else (young brothers wait),
+# so the workers start out with a real bound, then the other moves are handed
+# to the pool. The best score so far is kept in shared memory: every worker
+# reads it before starting a move and raises it when it finds a better one, so
+# moves that can't beat it are only searched far enough to show that. Starting
+# the workers costs more than a small search, so keep one ParallelSearch around
+# and close() it when done. workers=1 searches the moves in this process. With
+# tableBits, this process and every worker keep a ZobristTable of that size
+# across searches. With cachePath, they all share a PositionCache file.
+class ParallelSearch:
+   # Per process state, set up by _initWorker
+   _alpha = None
+   _engine = None
+   _searchId = None
+
+   def __init__(self, workers=None, orderings=None, evaluator=None, tableBits=None, cachePath=None):
+      self.workers = workers or os.cpu_count()
+      self.engine = ParallelSearch._newEngine(orderings, evaluator, tableBits, cachePath)
+      self.nodes = 0
+      self._bestScore = multiprocessing.Value('d', -Negamax.INFINITY)
+      self._searchCount = 0
+      self._pool = None
+      if self.workers > 1:
+         self._pool = ProcessPoolExecutor(self.workers, initializer=ParallelSearch._initWorker, \
+            initargs=(self._bestScore, orderings, evaluator, tableBits, cachePath))
+
+   def close(self):
+      if self._pool != None:
+         self._pool.shutdown()
+         self._pool = None
+      if self.engine.cache != None:
+         self.engine.cache.close()
+
+   def __enter__(self):
+      return self
+
+   def __exit__(self, *args):
+      self.close()
+
+   @staticmethod
+   def _newEngine(orderings, evaluator, tableBits, cachePath):
+      return Negamax(orderings, evaluator, \
+         table=None if tableBits == None else ZobristTable(tableBits), \
+         cache=None if cachePath == None else PositionCache(cachePath))
+
+   @staticmethod
+   def _initWorker(alpha, orderings, evaluator, tableBits, cachePath):
+      ParallelSearch._alpha = alpha
+      ParallelSearch._engine = ParallelSearch._newEngine(orderings, evaluator, tableBits, cachePath)
+
+   @staticmethod
+   def _searchMoveInWorker(searchId, board, idx, depth):
+      # The orderings only keep what they learn within one search
+      if searchId != ParallelSearch._searchId:
+         ParallelSearch._searchId = searchId
+         ParallelSearch._engine.reset()
+      result = ParallelSearch._searchMove(ParallelSearch._engine, ParallelSearch._alpha, board, idx, depth)
+      # Workers are never closed, so write what they found now
+      if ParallelSearch._engine.cache != None:
+         ParallelSearch._engine.cache.flush()
+      return result
+
+   # Searches one root move against the shared best score. Returns the move,
+   # its score (an upper bound if it can't beat the best score) and the nodes
+   # visited.
+   @staticmethod
+   def _searchMove(engine, alpha, board, idx, depth):
+      nodes = engine.nodes
+      bound = alpha.value
+      # Just under the best score, so a move that ties it gets an exact score
+      score = engine.searchMove(board, idx, depth, bound - Negamax.EPSILON)
+      if score > bound:
+         with alpha.get_lock():
+            if score > alpha.value:
+               alpha.value = score
+      return idx, score, engine.nodes - nodes
+
+   # Same as Negamax.search: the score from O's point of view and the best
+   # move for whoever's turn it is. Of equally good moves, the one first in
+   # Negamax's order is picked.
+   def search(self, board, depth=None):
+      self.engine.reset()
+      self._searchCount += 1
+      if depth == None:
+         depth = board.width * board.height - board.numFilled()
+      if board.getWinner() != None or depth == 0:
+         score, moveIdx = self.engine.search(board, depth)
+         self.nodes = self.engine.nodes
+         return score, moveIdx
+
+      stats = SearchStats.active
+      if stats is not None:
+         startTime = time.perf_counter()
+
+      moves = self.engine._orderMoves(board, 0)
+      self._bestScore.value = -Negamax.INFINITY
+      _, bestScore, nodes = ParallelSearch._searchMove(self.engine, self._bestScore, board, moves[0], depth)
+      bestIdx = moves[0]
+      self.nodes = 1 + nodes
+
+      if self._pool == None:
+         results = [ParallelSearch._searchMove(self.engine, self._bestScore, board, idx, depth) \
+            for idx in moves[1:]]
+      else:
+         futures = [self._pool.submit(ParallelSearch._searchMoveInWorker, self._searchCount, board, idx, depth) \
+            for idx in moves[1:]]
+         results = [future.result() for future in futures]
+
+      # Moves that fell short of the best score at the time scored below it,
+      # so only moves with exact scores can win here
+      for idx, score, nodes in results:
+         self.nodes += nodes
+         if score > bestScore:
+            bestScore = score
+            bestIdx = idx
+
+      if self.engine.cache != None:
+         self.engine.cache.flush()
+      if stats is not None:
+         stats.search(time.perf_counter() - startTime)
+      return Game.SYMBOL_TO_SCORE[board.nextSymbol()] * bestScore, bestIdx
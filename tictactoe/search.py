@@ -0,0 +1,224 @@
+import time
+
+from .board import SearchBoard
+from .game import Game
+from .stats import SearchStats
+from .tables import ZobristTable
+
+# Static evaluation used when a depth-limited search stops before the end of
+# the game. Every line that only one player has pieces in counts for that
+# player, weighted by how many pieces are already in it. The score is scaled to
+# stay strictly between Game.MIN_SCORE and Game.MAX_SCORE, so a real win always
+# beats a good looking position. Subclass and override evaluate() to plug in a
+# different heuristic.
+class Evaluator:
+   # How much more a line is worth for each extra piece in it
+   WEIGHT = 4
+
+   def evaluate(self, board):
+      score = 0
+      for x, o in zip(board._xCounts, board._oCounts):
+         if x and not o:
+            score -= Evaluator.WEIGHT ** x
+         elif o and not x:
+            score += Evaluator.WEIGHT ** o
+      maxScore = len(board._lines) * Evaluator.WEIGHT ** board.k
+      return score / (maxScore + 1)
+
+# Move ordering heuristics for Negamax. Each ordering gives every candidate
+# move a priority, and hears about the moves that caused a beta cutoff so it can
+# learn from them.
+class MoveOrdering:
+   def reset(self):
+      pass
+
+   # Higher priorities are searched first
+   def priority(self, board, idx, ply):
+      return 0
+
+   def cutoff(self, idx, ply, depth):
+      pass
+
+# Prefers squares on more winning lines, i.e. the center and then the corners
+# on 3x3
+class CenterOrdering(MoveOrdering):
+   def priority(self, board, idx, ply):
+      return len(board._squareLines[idx - 1])
+
+# Remembers the last two moves that caused a cutoff at each ply, since the same
+# refutation often works in sibling positions
+class KillerOrdering(MoveOrdering):
+   def reset(self):
+      self._killers = {}
+
+   def priority(self, board, idx, ply):
+      killers = self._killers.get(ply)
+      if killers == None or idx not in killers:
+         return 0
+      return 2 - killers.index(idx)
+
+   def cutoff(self, idx, ply, depth):
+      killers = self._killers.setdefault(ply, [])
+      if idx not in killers:
+         killers.insert(0, idx)
+         del killers[2:]
+
+# Prefers moves that have caused cutoffs anywhere in the tree, weighted
+# towards cutoffs far from the leaves
+class HistoryOrdering(MoveOrdering):
+   def reset(self):
+      self._history = {}
+
+   def priority(self, board, idx, ply):
+      return self._history.get(idx, 0)
+
+   def cutoff(self, idx, ply, depth):
+      self._history[idx] = self._history.get(idx, 0) + depth * depth
+
+# Alpha-beta search in negamax form, so one function handles both players.
+# Moves are tried in the order given by the orderings (compared in turn, so
+# the first ordering has the final say) and every move after the first is
+# searched with a null window first (principal variation search), only being
+# re-searched if it might beat the best move so far. Scores are returned from
+# O's point of view like the rest of the game. nodes and cutoffs count the work
+# done by the last search. With a ZobristTable, positions reached again (by
+# another move order, or in a later search) reuse the earlier result when it
+# was searched deep enough, and otherwise try its best move first. With a
+# PositionCache, exact results are shared with other runs and processes.
+class Negamax:
+   INFINITY = 999999
+   # Width of the null window. Scores can be fractions from the evaluator.
+   EPSILON = 1e-9
+
+   def __init__(self, orderings=None, evaluator=None, pvs=True, table=None, cache=None):
+      if orderings == None:
+         orderings = [KillerOrdering(), HistoryOrdering(), CenterOrdering()]
+      self.orderings = orderings
+      self.evaluator = evaluator or Evaluator()
+      self.pvs = pvs
+      self.table = table
+      self.cache = cache
+      self.nodes = 0
+      self.cutoffs = 0
+
+   # Returns the score and best move for whoever's turn it is, searching depth
+   # moves ahead or to the end of the game if depth is None
+   def search(self, board, depth=None):
+      self.reset()
+      stats = SearchStats.active
+      if stats is not None:
+         startTime = time.perf_counter()
+
+      color = Game.SYMBOL_TO_SCORE[board.nextSymbol()]
+      if depth == None:
+         depth = board.width * board.height - board.numFilled()
+      # The root always looks at its moves, so there's a move to return
+      depth = max(depth, 1)
+      score, moveIdx = self._negamax(SearchBoard(board), depth, -Negamax.INFINITY, Negamax.INFINITY, 0)
+      if self.cache is not None:
+         self.cache.flush()
+
+      if stats is not None:
+         stats.search(time.perf_counter() - startTime)
+      return color * score, moveIdx
+
+   def reset(self):
+      self.nodes = 0
+      self.cutoffs = 0
+      for ordering in self.orderings:
+         ordering.reset()
+
+   # Returns the score for the player whose turn it is if they play idx,
+   # looking depth moves ahead including that one. Scores no better than alpha
+   # are only searched far enough to show that, and come back as an upper
+   # bound. Doesn't reset the counters or orderings, so several moves from the
+   # same search can share what the orderings learn.
+   def searchMove(self, board, idx, depth, alpha=-INFINITY):
+      board = SearchBoard(board)
+      board.make(idx)
+      return -self._negamax(board, depth - 1, -Negamax.INFINITY, -alpha, 1)[0]
+
+   def _orderMoves(self, board, ply):
+      moves = [idx for idx in range(1, board.width * board.height + 1) if not board.isFilledByIdx(idx)]
+      if self.orderings:
+         # Stable sort, so ties stay in keypad order
+         moves.sort(key=lambda idx: tuple(o.priority(board, idx, ply) for o in self.orderings), reverse=True)
+      return moves
+
+   # Returns the score for the player whose turn it is on the SearchBoard, and
+   # their best move. The board is back to how it started when this returns.
+   def _negamax(self, board, depth, alpha, beta, ply):
+      self.nodes += 1
+      stats = SearchStats.active
+      if stats is not None:
+         stats.visit(board._numFilled)
+      winner = board._winner
+      color = Game.SYMBOL_TO_SCORE[board._symbol]
+      if winner != None:
+         return color * Game.SYMBOL_TO_SCORE[winner], 0
+      # _winner is only ever X or O, so a full board is checked for separately
+      if board._numFilled == board.width * board.height:
+         return color * Game.CAT_SCORE, 0
+      if depth == 0:
+         return color * self.evaluator.evaluate(board), 0
+
+      cache = self.cache
+      if cache is not None and depth >= cache.minDepth:
+         entry = cache.get(board, depth)
+         if entry is not None:
+            return color * entry[0], entry[2]
+
+      table = self.table
+      moves = self._orderMoves(board, ply)
+      startAlpha = alpha
+      if table is not None:
+         slot = table.probe(board._hash)
+         if slot is not None:
+            score = table.scores[slot]
+            flag = table.flags[slot]
+            # The root always searches, so it has a move to return
+            if ply > 0 and table.depths[slot] >= depth and (flag == ZobristTable.EXACT or \
+                  (flag == ZobristTable.LOWER and score >= beta) or \
+                  (flag == ZobristTable.UPPER and score <= alpha)):
+               return score, table.moves[slot]
+            hashMove = table.moves[slot]
+            if hashMove in moves:
+               moves.remove(hashMove)
+               moves.insert(0, hashMove)
+
+      bestScore = -Negamax.INFINITY
+      bestIdx = 0
+      for idx in moves:
+         board.make(idx)
+         if bestIdx == 0 or not self.pvs:
+            score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)[0]
+         else:
+            score = -self._negamax(board, depth - 1, -alpha - Negamax.EPSILON, -alpha, ply + 1)[0]
+            if alpha < score < beta:
+               score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)[0]
+         board.unmake()
+
+         if score > bestScore:
+            bestScore = score
+            bestIdx = idx
+         if score > alpha:
+            alpha = score
+         if alpha >= beta:
+            self.cutoffs += 1
+            if stats is not None:
+               stats.cutoffs += 1
+            for ordering in self.orderings:
+               ordering.cutoff(idx, ply, depth)
+            break
+
+      if table is not None:
+         if bestScore <= startAlpha:
+            flag = ZobristTable.UPPER
+         elif bestScore >= beta:
+            flag = ZobristTable.LOWER
+         else:
+            flag = ZobristTable.EXACT
+         table.store(board._hash, depth, bestScore, flag, bestIdx)
+      if cache is not None and depth >= cache.minDepth and startAlpha < bestScore < beta:
+         cache.put(board, color * bestScore, depth, bestIdx)
+      return bestScore, bestIdx
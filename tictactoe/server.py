@@ -0,0 +1,142 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+
+from .board import Board
+from .solved import SolvedTable
+
+# Hosts many games at once over a line based protocol, on TCP ("host:port") or
+# a Unix socket (a path). All sessions share one read-only solved table and
+# each one only holds its current board, so memory per game and time per move
+# stay flat however many games are running. The player is X and moves first.
+# The server greets each connection with "ok ready" before any command, on an
+# empty board. Commands and replies, one per line:
+#    new            ->  ok <board> 0 -
+#    board          ->  ok <board> 0 <winner or ->
+#    move <1-9>     ->  ok <board> <computer's move, 0 if none> <winner or ->
+#    quit           closes the connection
+# Anything invalid gets "error <reason>" and leaves the game as it was.
+class GameServer:
+   def __init__(self, solved=None):
+      if solved == None:
+         solved = SolvedTable.load() or SolvedTable.solve()
+      self._solved = solved
+      # Number of connected sessions
+      self.sessions = 0
+
+   @staticmethod
+   def _reply(board, moveIdx):
+      return "ok %s %i %s" % (board.asString(), moveIdx, board.getWinner() or "-")
+
+   # Applies one command to a session's board. Returns the new board and the
+   # reply line.
+   def command(self, board, line):
+      parts = line.split()
+      if not parts:
+         return board, "error empty command"
+
+      cmd = parts[0].lower()
+      if cmd == "new":
+         board = Board(3, 3)
+         return board, GameServer._reply(board, 0)
+      elif cmd == "board":
+         return board, GameServer._reply(board, 0)
+      elif cmd == "move":
+         if len(parts) != 2 or not parts[1].isdigit():
+            return board, "error usage: move <1-9>"
+         moveIdx = int(parts[1])
+         if board.getWinner() != None:
+            return board, "error game over"
+         if moveIdx < 1 or moveIdx > 9 or board.isFilledByIdx(moveIdx):
+            return board, "error illegal move " + parts[1]
+
+         board = board.move('X', moveIdx)
+         reply = 0
+         if board.getWinner() == None:
+            reply = self._solved.getBestMoveIdx(board)
+            board = board.move('O', reply)
+         return board, GameServer._reply(board, reply)
+      return board, "error unknown command " + cmd
+
+   async def handle(self, reader, writer):
+      self.sessions += 1
+      board = Board(3, 3)
+      try:
+         writer.write(b"ok ready\n")
+         while True:
+            line = await reader.readline()
+            if not line:
+               break
+            line = line.decode(errors="replace").strip()
+            if line.lower() == "quit":
+               break
+            board, reply = self.command(board, line)
+            writer.write(reply.encode() + b"\n")
+            await writer.drain()
+      except ConnectionError:
+         pass
+      finally:
+         self.sessions -= 1
+         writer.close()
+
+   async def start(self, address=None, backlog=1024, sock=None):
+      if sock != None:
+         if sock.family == socket.AF_UNIX:
+            return await asyncio.start_unix_server(self.handle, sock=sock, backlog=backlog)
+         return await asyncio.start_server(self.handle, sock=sock, backlog=backlog)
+      if "/" in address:
+         return await asyncio.start_unix_server(self.handle, address, backlog=backlog)
+      host, _, port = address.rpartition(":")
+      return await asyncio.start_server(self.handle, host or None, int(port), backlog=backlog)
+
+   def serve(self, address=None, sock=None):
+      async def run():
+         server = await self.start(address, sock=sock)
+         async with server:
+            await server.serve_forever()
+      asyncio.run(run())
+
+   @staticmethod
+   def listen(address, backlog=1024):
+      if "/" in address:
+         if os.path.exists(address):
+            os.remove(address)
+         sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+         sock.bind(address)
+      else:
+         host, _, port = address.rpartition(":")
+         sock = socket.create_server((host, int(port)))
+      sock.listen(backlog)
+      return sock
+
+   @staticmethod
+   def _serveWorker(handle, sock):
+      GameServer(SolvedTable.attach(handle)).serve(sock=sock)
+
+   # Pre-forks worker processes that all accept connections on one listening
+   # socket. The table is loaded or built once here and shared with every
+   # worker, so adding workers doesn't add copies of it.
+   @staticmethod
+   def serveWorkers(address, workers):
+      solved = SolvedTable.load() or SolvedTable.solve()
+      handle, shm = solved.share()
+      sock = GameServer.listen(address)
+      processes = [multiprocessing.Process(target=GameServer._serveWorker, args=(handle, sock)) \
+         for _ in range(workers)]
+      # Clean up the workers and shared memory when asked to stop, not just on ^C
+      signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+      try:
+         for process in processes:
+            process.start()
+         for process in processes:
+            process.join()
+      finally:
+         for process in processes:
+            process.terminate()
+         sock.close()
+         if shm != None:
+            shm.close()
+            shm.unlink()
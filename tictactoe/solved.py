@@ -0,0 +1,217 @@
+import mmap
+import os
+
+from .board import Board, SearchBoard
+from .game import Game
+
+# The value and best move of every reachable position, solved offline and
+# stored in a file indexed by Board.asInt(). Each position is one byte: the
+# minimax score + 1 in the high nibble and the best keypad index (0 if the game
+# is over) in the low nibble. Positions that can't be reached are UNKNOWN.
+class SolvedTable:
+   UNKNOWN = 0xFF
+   DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tictactoe.solved')
+
+   def __init__(self, data, width=3, path=None):
+      assert(len(data) == 3 ** (width * width))
+      self._data = data
+      self.width = width
+      # File the table is mapped from, if any
+      self._path = path
+      # Shared memory block the table lives in, if it was attached to one
+      self._shm = None
+
+   # Solves every position reachable from an empty board, X moving first
+   @staticmethod
+   def solve(width=3):
+      data = bytearray([SolvedTable.UNKNOWN]) * (3 ** (width * width))
+
+      # Walks one SearchBoard through every position
+      def solveBoard(board):
+         code = board.asInt()
+         if data[code] != SolvedTable.UNKNOWN:
+            return (data[code] >> 4) - 1
+
+         winner = board.getWinner()
+         bestIdx = 0
+         if winner != None:
+            score = Game.SYMBOL_TO_SCORE[winner]
+         else:
+            # Ties go to the lowest index, the same as the tree search
+            score = None
+            symbol = board.nextSymbol()
+            for idx in range(1, width * width + 1):
+               if not board.isFilledByIdx(idx):
+                  board.make(idx)
+                  result = solveBoard(board)
+                  board.unmake()
+                  if score == None or \
+                        (symbol == 'O' and result > score) or \
+                        (symbol == 'X' and result < score):
+                     score = result
+                     bestIdx = idx
+         data[code] = ((score + 1) << 4) | bestIdx
+         return score
+
+      solveBoard(SearchBoard(Board(width, width)))
+      return SolvedTable(data, width)
+
+   def write(self, path=DEFAULT_PATH):
+      with open(path, 'wb') as f:
+         f.write(self._data)
+
+   # Maps a solved table file into memory. Returns None if there's no file, so
+   # callers can fall back to building a search tree.
+   @staticmethod
+   def load(path=DEFAULT_PATH, width=3):
+      if not os.path.exists(path):
+         return None
+      with open(path, 'rb') as f:
+         data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+      return SolvedTable(data, width, path)
+
+   # Makes the table available to other processes without each one keeping a
+   # copy. A table mapped from a file is already shared through the page cache,
+   # so other processes just map the same file. A table built in memory is
+   # copied once into a shared memory block. Returns a handle to pass to
+   # attach(), and the SharedMemory (None for a file) which the caller has to
+   # close() and unlink() once the other processes are done with it.
+   def share(self):
+      if self._path != None:
+         return ('file', self._path), None
+
+      from multiprocessing import shared_memory
+      shm = shared_memory.SharedMemory(create=True, size=len(self._data))
+      shm.buf[:len(self._data)] = self._data
+      return ('shm', shm.name), shm
+
+   # Opens a table shared by another process, without copying it
+   @staticmethod
+   def attach(handle, width=3):
+      kind, name = handle
+      if kind == 'file':
+         return SolvedTable.load(name, width)
+
+      from multiprocessing import shared_memory
+      shm = shared_memory.SharedMemory(name=name)
+      table = SolvedTable(shm.buf[:3 ** (width * width)], width)
+      table._shm = shm
+      return table
+
+   def close(self):
+      if self._shm != None:
+         self._data.release()
+         self._shm.close()
+         self._shm = None
+      elif isinstance(self._data, mmap.mmap):
+         self._data.close()
+
+   def contains(self, board):
+      return board.width == self.width and board.k == self.width and \
+         self._data[board.asInt()] != SolvedTable.UNKNOWN
+
+   def _lookup(self, board):
+      entry = self._data[board.asInt()]
+      if entry == SolvedTable.UNKNOWN:
+         raise Exception("Board not in solved table: " + board.asString())
+      return entry
+
+   def getScore(self, board):
+      return (self._lookup(board) >> 4) - 1
+
+   def getBestMoveIdx(self, board):
+      return self._lookup(board) & 0x0F
+
+   # Score and best move of the position with this Board.asInt() code, or
+   # None if it can't be reached. For callers that keep track of the code
+   # themselves instead of building boards.
+   def getByCode(self, code):
+      entry = self._data[code]
+      if entry == SolvedTable.UNKNOWN:
+         return None
+      return (entry >> 4) - 1, entry & 0x0F
+
+# Solves every board of a given width at once with NumPy instead of searching.
+# Each square of each of the 3^n base 3 codes (Board.asInt) is decoded into a
+# digit array, wins are found with vectorized line checks, and values are
+# propagated backwards from full boards to the empty one, one move count at a
+# time. Meant for 3x3; the digit array needs 3^n * n bytes.
+class RetrogradeSolver:
+   def __init__(self, width=3):
+      self.width = width
+      # Filled in by solve(), all indexed by board code
+      self.values = None
+      self.moves = None
+      self.reachable = None
+
+   def solve(self):
+      # Imported here so NumPy is only needed by callers of the solver
+      import numpy as np
+
+      n = self.width * self.width
+      size = 3 ** n
+      codes = np.arange(size, dtype=np.int64)
+      # powers[i] is the place value of square i + 1, square 1 being the most
+      # significant digit like Board.asInt
+      powers = 3 ** np.arange(n - 1, -1, -1, dtype=np.int64)
+      digits = ((codes[:, None] // powers[None, :]) % 3).astype(np.int8)
+
+      xCount = (digits == 1).sum(axis=1)
+      oCount = (digits == 2).sum(axis=1)
+      filled = xCount + oCount
+      # X always moves first
+      valid = (xCount == oCount) | (xCount == oCount + 1)
+
+      xWin = np.zeros(size, dtype=bool)
+      oWin = np.zeros(size, dtype=bool)
+      for mask in Board.getLineMasks(self.width):
+         squares = [i for i in range(n) if mask & (1 << i)]
+         xWin |= (digits[:, squares] == 1).all(axis=1)
+         oWin |= (digits[:, squares] == 2).all(axis=1)
+      terminal = xWin | oWin | (filled == n)
+
+      values = np.zeros(size, dtype=np.int8)
+      values[xWin] = Game.SYMBOL_TO_SCORE['X']
+      values[oWin] = Game.SYMBOL_TO_SCORE['O']
+      moves = np.zeros(size, dtype=np.int8)
+
+      # Back up values from positions with one more piece. Ties go to the
+      # lowest index like the tree search, which argmin/argmax also do.
+      for count in range(n - 1, -1, -1):
+         nodes = codes[valid & ~terminal & (filled == count)]
+         xToMove = count % 2 == 0
+         piece = 1 if xToMove else 2
+         worst = Game.MAX_SCORE + 1 if xToMove else Game.MIN_SCORE - 1
+         candidates = np.full((len(nodes), n), worst, dtype=np.int8)
+         for i in range(n):
+            empty = digits[nodes, i] == 0
+            candidates[empty, i] = values[nodes[empty] + piece * powers[i]]
+         if xToMove:
+            best = candidates.argmin(axis=1)
+         else:
+            best = candidates.argmax(axis=1)
+         values[nodes] = candidates[np.arange(len(nodes)), best]
+         moves[nodes] = best + 1
+
+      # Walk forwards from the empty board to find which codes can come up
+      reachable = np.zeros(size, dtype=bool)
+      reachable[0] = True
+      for count in range(n):
+         nodes = codes[reachable & ~terminal & (filled == count)]
+         piece = 1 if count % 2 == 0 else 2
+         for i in range(n):
+            empty = nodes[digits[nodes, i] == 0]
+            reachable[empty + piece * powers[i]] = True
+
+      self.values = values
+      self.moves = moves
+      self.reachable = reachable
+      return self
+
+   # Packs the solved arrays into the same format as SolvedTable.solve()
+   def toSolvedTable(self):
+      import numpy as np
+
+      data = ((self.values.astype(np.int16) + 1) << 4) | self.moves
+      data[~self.reachable] = SolvedTable.UNKNOWN
+      return SolvedTable(bytearray(data.astype(np.uint8).tobytes()), self.width)
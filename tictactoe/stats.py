@@ -0,0 +1,56 @@
+# Counters for the searches, in place of debug tracing in the hot loops: nodes
+# visited at each depth (pieces on the board), alpha-beta cutoffs, transposition
+# table hits and misses, and time spent per search. Collection is off until
+# start() is called; while it's off the searches only pay for a None check.
+class SearchStats:
+   # The collector in use, or None when collection is off
+   active = None
+
+   def __init__(self):
+      self.nodesPerDepth = {}
+      self.cutoffs = 0
+      self.transpositionHits = 0
+      self.transpositionMisses = 0
+      self.searchTimes = []
+
+   @staticmethod
+   def start():
+      SearchStats.active = SearchStats()
+      return SearchStats.active
+
+   # Turns collection off and returns what was collected
+   @staticmethod
+   def stop():
+      stats = SearchStats.active
+      SearchStats.active = None
+      return stats
+
+   def visit(self, depth):
+      self.nodesPerDepth[depth] = self.nodesPerDepth.get(depth, 0) + 1
+
+   def transposition(self, hit):
+      if hit:
+         self.transpositionHits += 1
+      else:
+         self.transpositionMisses += 1
+
+   def search(self, seconds):
+      self.searchTimes.append(seconds)
+
+   def nodes(self):
+      return sum(self.nodesPerDepth.values())
+
+   def toDict(self):
+      return { \
+         'nodes': self.nodes(), \
+         'nodesPerDepth': dict(sorted(self.nodesPerDepth.items())), \
+         'cutoffs': self.cutoffs, \
+         'transpositionHits': self.transpositionHits, \
+         'transpositionMisses': self.transpositionMisses, \
+         'searches': len(self.searchTimes), \
+         'searchSeconds': self.searchTimes \
+      }
+
+   def toJson(self):
+      import json
+      return json.dumps(self.toDict())
@@ -0,0 +1,95 @@
+from .board import Board
+
+# The eight rotations and reflections of a square board all have the same
+# minimax value. This maps boards onto one representative per symmetry class
+# so the tree only needs a single subtree for each class.
+class Symmetry:
+   # Keypad index permutations, cached per board width
+   _transforms = {}
+
+   # Returns one permutation per rotation/reflection, identity first. perm[idx]
+   # is the keypad index that square idx moves to; perm[0] is unused.
+   @staticmethod
+   def getTransforms(width):
+      transforms = Symmetry._transforms.get(width)
+      if transforms == None:
+         last = width - 1
+         coordMaps = ( \
+            lambda x, y: (x, y), \
+            lambda x, y: (last - y, x), \
+            lambda x, y: (last - x, last - y), \
+            lambda x, y: (y, last - x), \
+            lambda x, y: (last - x, y), \
+            lambda x, y: (x, last - y), \
+            lambda x, y: (y, x), \
+            lambda x, y: (last - y, last - x) \
+         )
+         transforms = []
+         for coordMap in coordMaps:
+            perm = [0]
+            for idx in range(1, width * width + 1):
+               x, y = coordMap(Board.idxToX(idx, width), Board.idxToY(idx, width))
+               perm.append(Board.coordToIdx(x, y, width))
+            transforms.append(tuple(perm))
+         transforms = tuple(transforms)
+         Symmetry._transforms[width] = transforms
+      return transforms
+
+   @staticmethod
+   def inverse(perm):
+      result = [0] * len(perm)
+      for idx in range(1, len(perm)):
+         result[perm[idx]] = idx
+      return tuple(result)
+
+   @staticmethod
+   def _permuteMask(mask, perm):
+      result = 0
+      idx = 1
+      while mask:
+         if mask & 1:
+            result |= 1 << (perm[idx] - 1)
+         mask >>= 1
+         idx += 1
+      return result
+
+   # Returns a copy of the board with every square moved by perm
+   @staticmethod
+   def apply(board, perm):
+      newBoard = board._copy()
+      newBoard._xMask = Symmetry._permuteMask(board._xMask, perm)
+      newBoard._oMask = Symmetry._permuteMask(board._oMask, perm)
+      newBoard._recount()
+      return newBoard
+
+   # Returns the representative of the board's symmetry class (the variant with
+   # the smallest base 3 code) and the permutation that produces it
+   @staticmethod
+   def canonicalize(board):
+      best = None
+      bestCode = None
+      bestPerm = None
+      for perm in Symmetry.getTransforms(board.width):
+         candidate = Symmetry.apply(board, perm)
+         code = candidate.asInt()
+         if bestCode == None or code < bestCode:
+            best, bestCode, bestPerm = candidate, code, perm
+      return best, bestPerm
+
+   @staticmethod
+   def canonicalCode(board):
+      numSquares = board.width * board.height
+      return min(Board.masksToInt( \
+            Symmetry._permuteMask(board._xMask, perm), \
+            Symmetry._permuteMask(board._oMask, perm), \
+            numSquares) \
+         for perm in Symmetry.getTransforms(board.width))
+
+   # Maps a keypad index on fromBoard to the matching index on toBoard, where
+   # toBoard is a rotation/reflection of fromBoard
+   @staticmethod
+   def mapIdx(fromBoard, toBoard, idx):
+      for perm in Symmetry.getTransforms(fromBoard.width):
+         if Symmetry.apply(fromBoard, perm) == toBoard:
+            return perm[idx]
+      raise Exception("Boards not symmetric: (" + fromBoard.asString() + ", " + toBoard.asString() + ")")
@@ -0,0 +1,124 @@
+from array import array
+
+from .stats import SearchStats
+from .symmetry import Symmetry
+
+# Replaces the trie for finding duplicate boards in the minimax tree. Boards are
+# keyed by their base 3 code (Board.asInt), so a lookup is a single index into a
+# flat list instead of a walk down one trie level per square. A symmetric table
+# keys boards by their canonical code instead, so rotations and reflections of
+# a board share one node.
+class TranspositionTable:
+   # Largest number of codes stored in a flat list. Bigger boards fall back to
+   # a dict holding only the codes actually seen.
+   MAX_FLAT_SIZE = 3 ** 9
+
+   def __init__(self, width=3, height=3, symmetric=False):
+      size = 3 ** (width * height)
+      self.symmetric = symmetric
+      self._flat = size <= TranspositionTable.MAX_FLAT_SIZE
+      self._nodes = [None] * size if self._flat else {}
+      self._size = 0
+      self.hits = 0
+      self.misses = 0
+
+   def __len__(self):
+      return self._size
+
+   def _lookup(self, code):
+      return self._nodes[code] if self._flat else self._nodes.get(code)
+
+   def _key(self, board):
+      return Symmetry.canonicalCode(board) if self.symmetric else board.asInt()
+
+   # Returns the minimax node stored for this board, or None. For a symmetric
+   # table the node's board may be a rotation/reflection of the one passed in.
+   def get(self, board):
+      node = self._lookup(self._key(board))
+      self._count(node is not None)
+      return node
+
+   def _count(self, hit):
+      if hit:
+         self.hits += 1
+      else:
+         self.misses += 1
+      stats = SearchStats.active
+      if stats is not None:
+         stats.transposition(hit)
+
+   # Check if there is a minimax node for this board. If there is, return it.
+   # If there isn't, store the passed in minimax node and return it.
+   def checkMatchAndAdd(self, board, newNode):
+      code = self._key(board)
+      node = self._lookup(code)
+      self._count(node is not None)
+      if node is None:
+         self._nodes[code] = newNode
+         self._size += 1
+         return newNode
+      return node
+
+   def stats(self):
+      return {'size': self._size, 'hits': self.hits, 'misses': self.misses}
+
+# Fixed size transposition table for Negamax, indexed by Zobrist hash so its
+# memory doesn't depend on the board size. Each slot holds one position: its
+# full hash, the depth it was searched to, its score for the player to move,
+# whether that score is exact or a bound, and the best move found. When two
+# positions land in the same slot the one searched deeper stays.
+class ZobristTable:
+   EXACT = 0
+   # The score is at least / at most the stored one
+   LOWER = 1
+   UPPER = 2
+
+   # 2 ** DEFAULT_BITS slots of 21 bytes each is about 5 MiB
+   DEFAULT_BITS = 18
+
+   def __init__(self, sizeBits=DEFAULT_BITS):
+      size = 1 << sizeBits
+      self._mask = size - 1
+      self.keys = array('Q', bytes(8 * size))
+      self.depths = array('h', [-1]) * size
+      self.scores = array('d', bytes(8 * size))
+      self.flags = array('b', bytes(size))
+      self.moves = array('H', bytes(2 * size))
+      self.hits = 0
+      self.misses = 0
+      self.stores = 0
+      self.replacements = 0
+
+   def __len__(self):
+      return len(self.depths) - self.depths.count(-1)
+
+   # Returns the slot holding this hash, or None
+   def probe(self, key):
+      slot = key & self._mask
+      hit = self.depths[slot] >= 0 and self.keys[slot] == key
+      if hit:
+         self.hits += 1
+      else:
+         self.misses += 1
+      stats = SearchStats.active
+      if stats is not None:
+         stats.transposition(hit)
+      return slot if hit else None
+
+   def store(self, key, depth, score, flag, moveIdx):
+      slot = key & self._mask
+      oldDepth = self.depths[slot]
+      if oldDepth >= 0 and self.keys[slot] != key:
+         if oldDepth > depth:
+            return
+         self.replacements += 1
+      self.keys[slot] = key
+      self.depths[slot] = depth
+      self.scores[slot] = score
+      self.flags[slot] = flag
+      self.moves[slot] = moveIdx
+      self.stores += 1
+
+   def stats(self):
+      return {'size': len(self.depths), 'hits': self.hits, 'misses': self.misses, \
+         'stores': self.stores, 'replacements': self.replacements}
@@ -0,0 +1,1337 @@
+from math import factorial
+from functools import reduce
+import array
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from .batch import BatchAnalyzer
+from .board import Zobrist, Board, SearchBoard
+from .cache import PositionCache
+from .engine import Engine
+from .export import PositionExporter
+from .game import Game
+from .gamelog import GameLogAnalyzer
+from .log import MyLogger
+from .parallel import ParallelSearch
+from .search import Evaluator, Negamax
+from .server import GameServer
+from .solved import SolvedTable, RetrogradeSolver
+from .stats import SearchStats
+from .symmetry import Symmetry
+from .tables import TranspositionTable, ZobristTable
+from .tree import Node, TreeStore
+from .trie import TrieNode
+
+# Run with python -m tictactoe -t
+
+def test():
+   testIdxToX()
+   testIdxToY()
+   testCoordToIdx()
+   testIdxCoordsLargeBoard()
+   testMove()
+   testBoardInit()
+   testGetByCoord()
+   testBoardPrint()
+   testGetWinnerVert()
+   testGetWinnerHoriz()
+   testGetWinnerDiagFS()
+   testGetWinnerDiagBS()
+   testGetWinnerCats()
+   testGetWinnerKInARow()
+   testLineCounters()
+   testEvaluator()
+   testDepthLimitedSearch()
+   testAsString()
+   testAsBase3()
+   testAsInt()
+   testLineMasks()
+   testTrieMatchAndAddFirst()
+   testTrieMatchAndAddFullerGame()
+   testTranspositionTable()
+   testSymmetryTransforms()
+   testSymmetryCanonicalize()
+   testDiffBoard()
+   testChoose()
+   testLogger()
+   testGenTree()
+   testSymmetricGenTree()
+   testSolvedTable()
+   testNegamax()
+   testSearchStats()
+   testRetrogradeSolver()
+   testBoardFromString()
+   testBatchAnalyzer()
+   testGameServer()
+   testSharedSolvedTable()
+   testTreeStore()
+   testLazyExpansion()
+   testParallelSearch()
+   testChildEdges()
+   testSearchBoard()
+   testZobrist()
+   testPositionCache()
+   testEngine()
+   testGameLogAnalyzer()
+   testPositionExporter()
+
+def testZobrist():
+   # The hash is updated incrementally and matches one built from scratch
+   rng = random.Random(3)
+   for width in (3, 4, 7):
+      keys = Zobrist.getKeys(width * width, width)
+      board = SearchBoard(Board(width, width))
+      hashes = [0]
+      for idx in rng.sample(range(1, width * width + 1), width * width - 1):
+         board.make(idx)
+         assert(Zobrist.hashMasks(board._xMask, board._oMask, keys) == board.zobristKey())
+         assert(board.snapshot().zobristKey() == board.zobristKey())
+         hashes.append(board.zobristKey())
+      for expected in reversed(hashes[:-1]):
+         board.unmake()
+         assert(expected == board.zobristKey())
+   b = Board(3, 3).move('X', 1).move('O', 5)
+   assert(b.zobristKey() == Board(3, 3).move('O', 5).move('X', 1).zobristKey())
+   assert(b.zobristKey() == Board.fromString(b.asString()).zobristKey())
+   assert(b.zobristKey() != Board(3, 3).move('X', 5).move('O', 1).zobristKey())
+
+   # Replace by depth: a shallower result for another position in the same
+   # slot is dropped, a deeper one replaces it
+   table = ZobristTable(4)
+   table.store(3, 5, 0.5, ZobristTable.EXACT, 7)
+   table.store(3 + 16, 2, 0.1, ZobristTable.EXACT, 1)
+   assert(None == table.probe(3 + 16))
+   slot = table.probe(3)
+   assert(5 == table.depths[slot] and 0.5 == table.scores[slot] and 7 == table.moves[slot])
+   table.store(3 + 32, 6, -1, ZobristTable.LOWER, 2)
+   assert(None == table.probe(3))
+   assert(None != table.probe(3 + 32))
+   assert(1 == len(table) and 1 == table.replacements)
+
+   # Searching with a table gives the same results with fewer nodes
+   solved = SolvedTable.load() or SolvedTable.solve()
+   for board in (Board(3, 3), Board(3, 3).move('X', 1), Board(3, 3).move('X', 5).move('O', 1).move('X', 9)):
+      plain = Negamax()
+      plain.search(board)
+      engine = Negamax(table=ZobristTable(12))
+      score, moveIdx = engine.search(board)
+      assert(score == solved.getScore(board))
+      assert(score == solved.getScore(board.move(board.nextSymbol(), moveIdx)))
+      assert(engine.nodes < plain.nodes)
+   b = Board(4, 4, 4).move('X', 6)
+   engine = Negamax(table=ZobristTable())
+   assert(abs(Negamax().search(b, 5)[0] - engine.search(b, 5)[0]) < Negamax.EPSILON)
+   # Searching again finds the root's children in the table
+   engine.search(b, 5)
+   assert(engine.nodes < 20)
+   print("success!")
+
+def testPositionCache():
+   b1 = Board(4, 4).move('X', 6)
+   b2 = Board(4, 4).move('X', 7)
+   b3 = Board(4, 4, 3).move('X', 6)
+   with tempfile.TemporaryDirectory() as directory:
+      path = os.path.join(directory, 'test_output.cache')
+      with PositionCache(path, maxEntries=2) as cache:
+         cache.put(b1, 0.25, 4, 7)
+         assert((0.25, 4, 7) == cache.get(b1, 3))
+         # Not searched deep enough
+         assert(None == cache.get(b1, 5))
+         assert(None == cache.get(b1))
+         # Same squares, different k
+         assert(None == cache.get(b3, 1))
+         cache.put(b2, -0.5, 2, 1)
+         cache.put(b3, 1, None, 11)
+         assert((1, 15, 11) == cache.get(b3, 20))
+         # The oldest entry was evicted from memory but is still on disk
+         cache.flush()
+         assert(1 == cache.evictions)
+         assert((0.25, 4, 7) == cache.get(b1, 4))
+         assert(1 == cache.diskHits and 3 == cache.misses)
+         # A shallower result doesn't replace a deeper one
+         cache.put(b1, 0.75, 2, 8)
+         assert((0.25, 4, 7) == cache.get(b1, 4))
+
+      with PositionCache(path, maxDiskEntries=2) as cache:
+         assert((-0.5, 2, 1) == cache.get(b2, 2))
+         # Rewriting a deeper result counts as a new write
+         cache.put(b1, 0.5, 5, 3)
+         cache.flush()
+         cache.put(Board(4, 4).move('X', 8), 0, 3, 2)
+         cache.flush()
+         # The two written longest ago are gone
+         assert(2 == len(cache) and 2 == cache.diskEvictions)
+         assert(None == cache.get(b3, 1))
+      with PositionCache(path) as cache:
+         assert((0.5, 5, 3) == cache.get(b1, 5))
+         assert(None == cache.get(b2, 1))
+
+      # A second run answers from the cache
+      os.remove(path)
+      b = Board(4, 4, 4).move('X', 6)
+      with PositionCache(path) as cache:
+         first = Negamax(cache=cache)
+         expected = first.search(b, 4)
+         assert(len(cache) > 0)
+      with PositionCache(path) as cache:
+         second = Negamax(cache=cache)
+         assert(expected == second.search(b, 4))
+         assert(1 == second.nodes)
+
+         root = Node(b, 1, TranspositionTable(4, 4))
+         assert(expected == root.getBestMove(depth=4, cache=cache))
+         assert(expected[1] == root.getBestMoveIdx(depth=4, cache=cache))
+         assert(not root._expanded)
+   print("success!")
+
+def testParallelSearch():
+   solved = SolvedTable.load() or SolvedTable.solve()
+   boards = [Board(3, 3), Board(3, 3).move('X', 1), Board(3, 3).move('X', 5).move('O', 1).move('X', 9)]
+   for workers in (1, 2):
+      with ParallelSearch(workers) as parallel:
+         for board in boards:
+            score, moveIdx = parallel.search(board)
+            assert(score == solved.getScore(board))
+            assert(score == solved.getScore(board.move(board.nextSymbol(), moveIdx)))
+
+         # Depth-limited on a bigger board it agrees with Negamax on the score
+         b = Board(5, 5, 4).move('X', 13).move('O', 7).move('X', 12)
+         score, moveIdx = parallel.search(b, 3)
+         assert(abs(score - Negamax().search(b, 3)[0]) < Negamax.EPSILON)
+         assert(abs(score - Negamax().search(b.move('O', moveIdx), 2)[0]) < Negamax.EPSILON)
+
+         # Same results through Node
+         board = Board(3, 3).move('X', 1)
+         root = Node(board, 1, TranspositionTable())
+         score, moveIdx = root.getBestMove(parallel=parallel)
+         assert(score == 0)
+         assert(moveIdx == root.getBestMoveIdx(parallel=parallel))
+   print("success!")
+
+def testChildEdges():
+   board = Board(3, 3).move('X', 1)
+   root = Node(board, 1, TranspositionTable())
+   root.expand()
+   assert([2, 3, 4, 5, 6, 7, 8, 9] == list(root.children))
+   for idx, child in root.children.items():
+      assert(board.move('O', idx) == child._board)
+      assert(child is root.getChild(idx))
+      assert(child is root.getChildNodeByBoard(board.move('O', idx)))
+   assert(5 == root.getBestMoveIdx())
+
+   # With symmetry the children can be stored rotated/reflected, but the edges
+   # are still in the parent's orientation
+   table = TranspositionTable(symmetric=True)
+   root = Node(board, 1, table)
+   table.checkMatchAndAdd(board, root)
+   child = root.getChild(9)
+   assert(table.get(board.move('O', 9)) is child)
+   assert(child is root.getChildNodeByBoard(board.move('O', 9)))
+   assert(root.getChild(2) is root.getChild(4))
+   print("success!")
+
+def testSearchBoard():
+   start = Board(4, 4, 3).move('X', 6)
+   board = SearchBoard(start)
+   expected = start
+   for idx in (7, 11, 1, 16, 2):
+      expected = expected.move(expected.nextSymbol(), idx)
+      board.make(idx)
+      assert(expected == board)
+      assert(expected._xCounts == board._xCounts and expected._oCounts == board._oCounts)
+      assert(expected.getWinner() == board.getWinner())
+      assert(expected.numFilled() == board.numFilled())
+      assert(expected.nextSymbol() == board.nextSymbol())
+   # X has 6, 11 and 16
+   assert('X' == board.getWinner())
+
+   # Snapshots and copies don't change with the search board
+   snapshot = board.snapshot()
+   child = board.move('O', 3)
+   for _ in range(5):
+      board.unmake()
+   assert(expected == snapshot and expected.getWinner() == snapshot.getWinner())
+   assert(expected.move('O', 3) == child)
+   assert(start == board)
+   assert(start._xCounts == board._xCounts and start._oCounts == board._oCounts)
+   assert(None == board.getWinner() and 'O' == board.nextSymbol() and 1 == board.numFilled())
+   print("success!")
+
+def testDiffBoard():
+   b0 = Board(3, 3)
+   b1 = b0.move('X', 1)
+   assert(('X', 1) == b0.diffBoard(b1))
+
+   b2 = b1.move('O', 8)
+   assert(('O', 8) == b1.diffBoard(b2))
+
+   b3 = b2.move('X', 2)
+   assert(('X', 2) == b2.diffBoard(b3))
+
+   b4 = b3.move('O', 5)
+   assert(('O', 5) == b3.diffBoard(b4))
+
+   b5 = b4.move('X', 9)
+   assert(('X', 9) == b4.diffBoard(b5))
+
+def testTrieMatchAndAddFirst():
+   b0 = Board(3, 3)
+   t1 = TrieNode()
+   b1 = b0.move('X', 1)
+   n1 = Node(b1, 1, t1)
+   t1.node = n1
+
+   b0b = Board(3, 3)
+   b1b = b0b.move('X', 1)
+   n1b = Node(b1b, 1, t1)
+
+   assert(not b0b is b0)
+   assert(not b1b is b1)
+   assert(not n1b is n1)
+
+   print('test')
+   resultNode = t1.checkMatchAndAdd("=" + b1.asString(), n1)
+   assert(None != resultNode)
+   assert(n1 is resultNode)
+   assert(not n1b is resultNode)
+
+   print('test1')
+   resultNode = t1.checkMatchAndAdd("=" + b1.asString(), n1b)
+   assert(None != resultNode)
+   assert(n1 is resultNode)
+   assert(not n1b is resultNode)
+
+def checkTrieMatching(trie, node1, node2):
+   assert(not node1 is node2)
+
+   #First time should return node passed in
+   resultNode = trie.checkMatchAndAdd("=" + node1._board.asString(), node1)
+   assert(None != resultNode)
+   assert(node1 is resultNode)
+   assert(not node2 is resultNode)
+
+   #Second time should still return first node
+   resultNode = trie.checkMatchAndAdd("=" + node1._board.asString(), node2)
+   assert(None != resultNode)
+   assert(node1 is resultNode)
+   assert(not node2 is resultNode)
+
+def testTrieMatchAndAddFullerGame():
+   t1 = TrieNode()
+
+   b0 = Board(3, 3)
+   b1 = b0.move('X', 1)
+   n1 = Node(b1, -1, t1)
+   t1.node = n1
+
+   b2 = b1.move('O', 5) \
+         .move('X', 2) \
+         .move('O', 6) \
+         .move('X', 7) \
+         .move('O', 8) \
+         .move('X', 9)
+   n2 = Node(b2, 1, t1)
+
+   b2b = b1.move('O', 5) \
+         .move('X', 2) \
+         .move('O', 6) \
+         .move('X', 7) \
+         .move('O', 8) \
+         .move('X', 9)
+   n2b = Node(b2b, 1, t1)
+
+   print('test3')
+   checkTrieMatching(t1, n2, n2b)
+
+   b3 = b1.move('O', 5) \
+         .move('X', 2) \
+         .move('X', 6) \
+         .move('O', 7) \
+         .move('O', 8) \
+         .move('X', 9)
+   n3 = Node(b3, 1, t1)
+
+   b3b = b1.move('O', 5) \
+         .move('X', 2) \
+         .move('X', 6) \
+         .move('O', 7) \
+         .move('O', 8) \
+         .move('X', 9)
+   n3b = Node(b3b, 1, t1)
+
+   print('test4')
+   checkTrieMatching(t1, n3, n3b)
+
+   b4 = b1.move('O', 5) \
+         .move('X', 2) \
+         .move('X', 6) \
+         .move('O', 7) \
+         .move('O', 8) \
+         .move('O', 9)
+   n4 = Node(b4, 1, t1)
+
+   b4b = b1.move('O', 5) \
+         .move('X', 2) \
+         .move('X', 6) \
+         .move('O', 7) \
+         .move('O', 8) \
+         .move('O', 9)
+   n4b = Node(b4b, 1, t1)
+
+   print('test5')
+   checkTrieMatching(t1, n4, n4b)
+
+   b5 = b1.move('X', 5) \
+         .move('X', 2) \
+         .move('X', 6) \
+         .move('O', 7) \
+         .move('O', 8) \
+         .move('O', 9)
+   n5 = Node(b5, 1, t1)
+
+   b5b = b1.move('X', 5) \
+         .move('X', 2) \
+         .move('X', 6) \
+         .move('O', 7) \
+         .move('O', 8) \
+         .move('O', 9)
+   n5b = Node(b5b, 1, t1)
+
+   print('test6')
+   checkTrieMatching(t1, n5, n5b)
+
+
+def testTranspositionTable():
+   table = TranspositionTable()
+   b1 = Board(3, 3).move('X', 1).move('O', 5)
+   b2 = Board(3, 3).move('O', 5).move('X', 1)
+   n1 = Node(b1, -1, table)
+   n2 = Node(b2, -1, table)
+
+   assert(None == table.get(b1))
+   assert(n1 is table.checkMatchAndAdd(b1, n1))
+   assert(n1 is table.checkMatchAndAdd(b2, n2))
+   assert(n1 is table.get(b2))
+   assert(1 == len(table))
+   assert({'size': 1, 'hits': 2, 'misses': 2} == table.stats())
+
+   # Boards too big for a flat list are kept in a dict
+   bigTable = TranspositionTable(4, 4)
+   assert(not bigTable._flat)
+   print("success!")
+
+def testSymmetryTransforms():
+   transforms = Symmetry.getTransforms(3)
+   assert(8 == len(transforms))
+   assert(8 == len(set(transforms)))
+   assert(tuple(range(10)) == transforms[0])
+   for perm in transforms:
+      # The center never moves and corners stay corners
+      assert(5 == perm[5])
+      assert(set((1, 3, 7, 9)) == set(perm[i] for i in (1, 3, 7, 9)))
+      assert(tuple(range(10)) == tuple(Symmetry.inverse(perm)[perm[i]] for i in range(10)))
+   print("success!")
+
+def testSymmetryCanonicalize():
+   corners = [Board(3, 3).move('X', idx).move('O', 5) for idx in (1, 3, 7, 9)]
+   codes = set(Symmetry.canonicalCode(b) for b in corners)
+   assert(1 == len(codes))
+   assert(Symmetry.canonicalCode(Board(3, 3).move('X', 2)) not in codes)
+
+   b = Board(3, 3).move('X', 1).move('O', 2)
+   canonical, perm = Symmetry.canonicalize(b)
+   assert(canonical == Symmetry.apply(b, perm))
+   assert(canonical.asInt() == Symmetry.canonicalCode(b))
+   assert(perm[1] == Symmetry.mapIdx(b, canonical, 1))
+   print("success!")
+
+def testSymmetricGenTree():
+   sizes = []
+   for symmetric in (False, True):
+      table = TranspositionTable(symmetric=symmetric)
+      root = Node(Board(3, 3).move('X', 5), 1, table)
+      table.checkMatchAndAdd(root._board, root)
+      root.genTree()
+      sizes.append(len(table))
+   print('Nodes without/with symmetry: ' + str(sizes))
+   assert(sizes[1] * 5 < sizes[0])
+
+   # Best moves found through the symmetric tree are real moves on the board
+   table = TranspositionTable(symmetric=True)
+   board = Board(3, 3).move('X', 1)
+   root = Node(board, 1, table)
+   table.checkMatchAndAdd(board, root)
+   root.genTree()
+   assert(5 == root.getBestMoveIdx())
+   board = board.move('O', 5).move('X', 9)
+   node = table.get(board)
+   moveIdx = Symmetry.mapIdx(node._board, board, node.getBestMoveIdx())
+   assert(moveIdx in (2, 4, 6, 8))
+   print("success!")
+
+def testAsBase3():
+   board = Board(3, 3)
+   board = board.move('X', 1)
+   board = board.move('X', 2)
+   board = board.move('O', 4)
+   board = board.move('O', 6)
+   board = board.move('X', 8)
+   board = board.move('O', 9)
+   assert("110202012" == board.asBase3())
+   print("success!")
+
+def testAsInt():
+   board = Board(3, 3)
+   assert(0 == board.asInt())
+   board = board.move('X', 1)
+   board = board.move('X', 2)
+   board = board.move('O', 4)
+   board = board.move('O', 6)
+   board = board.move('X', 8)
+   board = board.move('O', 9)
+   assert(int("110202012", 3) == board.asInt())
+   print("success!")
+
+def testLineMasks():
+   lines = Board.getLineMasks(3)
+   assert(8 == len(lines))
+   # Bottom row, middle column and both diagonals in keypad indices
+   for idxs in ((1, 2, 3), (2, 5, 8), (1, 5, 9), (3, 5, 7)):
+      assert(reduce(lambda m, i: m | (1 << (i - 1)), idxs, 0) in lines)
+   assert(lines is Board.getLineMasks(3))
+   print("success!")
+
+def testAsString():
+   board = Board(3, 3)
+   board = board.move('X', 1)
+   board = board.move('X', 2)
+   board = board.move('O', 4)
+   board = board.move('O', 6)
+   board = board.move('X', 8)
+   board = board.move('O', 9)
+   assert("XX-O-O-XO" == board.asString())
+   print("success!")
+
+def choose(n, r):
+   if n < r:
+      raise Exception
+   return factorial(n) / (factorial(r) * factorial(n - r))
+
+def testChoose():
+   assert(15 == choose(6, 2))
+   assert(1 == choose(6, 6))
+   assert(1 == choose(6, 0))
+   assert(126 == choose(9, 5))
+   print("success!")
+
+def testGenTree():
+   b0 = Board(3, 3)
+   t1 = TranspositionTable()
+   b1 = b0.move('X', 1)
+   root = Node(b1, 1, t1)
+   t1.checkMatchAndAdd(b1, root)
+
+   print('Generating tree:')
+   print(Node.levelCount)
+   root.genTree()
+   print('Num nodes: ' + str(Node.num))
+   assert(Node.num + 1 == len(t1))
+   print('Table: ' + str(t1.stats()))
+   print('levels:')
+   print(Node.levelCount)
+   maxNodes = 0
+
+   #Number of max nodes is much smaller because of the transposition table
+   #Calculate number of nodes if all games played to a full board
+   #for i in range(1,10):
+   #  maxNodes += (factorial(9) / factorial(i))
+
+   maxNodes = 3**9
+
+   #Should have less than this number of nodes
+   #assert(maxNodes > Node.num)
+   print(str(maxNodes))
+
+   #Calculate the number of
+"""
+   numWins = 0
+   for turn in range(3, 10):
+      numWins += 6 *
+
+   expectedMovesNum = 0
+   def preFun(node):
+      nonlocal expectedMovesNum
+      assert(expectedMovesNum == node.numFilled())
+      expectedMovesNum += 1
+
+   def postFun(node):
+      nonlocal expectedMovesNum
+      print(node)
+      expectedMovesNum -= 1
+
+   iterTree(root, preFun, postFun)
+"""
+
+
+def testSolvedTable():
+   solved = SolvedTable.solve()
+   assert(0 == solved.getScore(Board(3, 3)))
+   assert(SolvedTable.UNKNOWN == solved._data[Board(3, 3).move('O', 1).asInt()])
+
+   # Same answers as searching the minimax tree
+   for firstIdx in range(1, 10):
+      table = TranspositionTable()
+      board = Board(3, 3).move('X', firstIdx)
+      root = Node(board, 1, table)
+      table.checkMatchAndAdd(board, root)
+      root.genTree()
+      score, _ = root.getBestMove()
+      assert(score == solved.getScore(board))
+      assert(root.getBestMoveIdx() == solved.getBestMoveIdx(board))
+
+   # Round trip through a memory-mapped file
+   with tempfile.TemporaryDirectory() as directory:
+      path = os.path.join(directory, 'test_output.solved')
+      solved.write(path)
+      loaded = SolvedTable.load(path)
+      board = Board(3, 3).move('X', 1).move('O', 5).move('X', 9)
+      assert(solved.getBestMoveIdx(board) == loaded.getBestMoveIdx(board))
+      assert(solved._data == loaded._data[:])
+      loaded._data.close()
+
+   # The shipped table is up to date
+   shipped = SolvedTable.load()
+   assert(shipped != None)
+   assert(solved._data == shipped._data[:])
+   print("success!")
+
+def testNegamax():
+   solved = SolvedTable.solve()
+   boards = [Board(3, 3).move('X', idx) for idx in range(1, 10)]
+   boards.append(Board(3, 3).move('X', 1).move('O', 2).move('X', 5))
+   boards.append(Board(3, 3).move('X', 5).move('O', 1).move('X', 9))
+
+   plainNodes = 0
+   orderedNodes = 0
+   treeNodes = 0
+   for board in boards:
+      plain = Negamax(orderings=[], pvs=False)
+      score, moveIdx = plain.search(board)
+      plainNodes += plain.nodes
+      assert(score == solved.getScore(board))
+      assert(moveIdx == solved.getBestMoveIdx(board))
+
+      ordered = Negamax()
+      score, moveIdx = ordered.search(board)
+      orderedNodes += ordered.nodes
+      assert(score == solved.getScore(board))
+      # Ordering can pick a different move, as long as it's just as good
+      assert(score == solved.getScore(board.move(board.nextSymbol(), moveIdx)))
+
+      table = TranspositionTable()
+      root = Node(board, Game.SYMBOL_TO_SCORE[board.nextSymbol()], table)
+      SearchStats.start()
+      root.getBestMove()
+      treeNodes += SearchStats.stop().nodes()
+
+   print('Nodes visited: tree %i, negamax %i, with ordering and PVS %i' % (treeNodes, plainNodes, orderedNodes))
+   assert(plainNodes == treeNodes)
+   assert(orderedNodes < plainNodes)
+
+   # Depth-limited search on a big board still finds the open win
+   b = Board(7, 7, 5)
+   for idx in (22, 23, 24, 25):
+      b = b.move('O', idx)
+   for idx in (1, 9, 17, 33, 41):
+      b = b.move('X', idx)
+   score, moveIdx = Negamax().search(b, 2)
+   assert(Game.MAX_SCORE == score)
+   assert(moveIdx in (21, 26))
+
+   # Searching deeper than the squares left ends in a draw on a full board
+   b = Board.fromString('XOXOXOXOOXOXOX--', 4)
+   for search in (Negamax(), Negamax(table=ZobristTable())):
+      score, moveIdx = search.search(b, 3)
+      assert(Game.CAT_SCORE == score and moveIdx in (15, 16))
+
+   # Depth 0 still searches the root's moves, so it returns a legal move
+   b = Board(4, 4, 3).move('X', 6)
+   assert(Negamax().search(b, 1) == Negamax().search(b, 0))
+   print("success!")
+
+def testSearchStats():
+   def search():
+      table = TranspositionTable()
+      board = Board(3, 3).move('X', 1)
+      root = Node(board, 1, table)
+      table.checkMatchAndAdd(board, root)
+      root.getBestMove()
+
+   assert(None == SearchStats.active)
+   stats = SearchStats.start()
+   search()
+   negamax = Negamax()
+   negamax.search(Board(3, 3))
+   assert(stats is SearchStats.stop())
+   assert(None == SearchStats.active)
+
+   result = json.loads(stats.toJson())
+   assert(2 == result['searches'])
+   assert(0 < result['cutoffs'])
+   assert(0 < result['transpositionHits'] and 0 < result['transpositionMisses'])
+   assert(1 == result['nodesPerDepth']['0'])
+   assert(result['nodes'] == sum(result['nodesPerDepth'].values()))
+   print("success!")
+
+def testRetrogradeSolver():
+   try:
+      import numpy
+   except ImportError:
+      print("skipped, NumPy isn't installed")
+      return
+
+   start = time.perf_counter()
+   solver = RetrogradeSolver().solve()
+   retrogradeTime = time.perf_counter() - start
+   start = time.perf_counter()
+   solved = SolvedTable.solve()
+   searchTime = time.perf_counter() - start
+   print('Retrograde solve %.1f ms, minimax solve %.1f ms' % (retrogradeTime * 1000, searchTime * 1000))
+
+   # Every reachable position has the same value and move as minimax
+   assert(solved._data == solver.toSolvedTable()._data)
+   assert(int(numpy.count_nonzero(solver.reachable)) == \
+      sum(1 for entry in solved._data if entry != SolvedTable.UNKNOWN))
+   # O has to take an edge after X takes opposite corners
+   board = Board(3, 3).move('X', 1).move('O', 5).move('X', 9)
+   assert(Game.CAT_SCORE == solver.values[board.asInt()])
+   assert(2 == solver.moves[board.asInt()])
+   print("success!")
+
+def testBoardFromString():
+   board = Board(3, 3).move('X', 1).move('X', 2).move('O', 4).move('O', 6).move('X', 8).move('O', 9)
+   assert(board == Board.fromString("XX-O-O-XO"))
+   assert(board.getWinner() == Board.fromString("XX-O-O-XO").getWinner())
+   assert(4 == Board.fromString("-" * 16).width)
+   assert(5 == Board.fromString("-" * 49, 5).k)
+   for bad, k in (("XX-", None), ("XX-O-O-XA", None), ("XX-O-O-XO", 4), ("XX-O-O-XO", 0)):
+      try:
+         Board.fromString(bad, k)
+         assert(False)
+      except ValueError:
+         pass
+   print("success!")
+
+def testBatchAnalyzer():
+   lines = ["---------\n", "X---O---X\n", "XXXOO----\n", "\n", "bad\n", "X---O---X-------\n"] * 50
+   results = []
+   for workers in (1, 2):
+      out = io.StringIO()
+      BatchAnalyzer.run(iter(lines), out, workers, depth=4, blockSize=64)
+      results.append(out.getvalue().splitlines())
+
+   assert(results[0] == results[1])
+   assert(250 == len(results[0]))
+   assert("---------\t0\t1\t-" == results[0][0])
+   assert("X---O---X\t0\t2\t-" == results[0][1])
+   assert("XXXOO----\t-1\t0\tX" == results[0][2])
+   assert("bad\tinvalid" == results[0][3])
+   assert(results[0][4].startswith("X---O---X-------\t"))
+
+   # Without a depth, bigger boards are searched Game.DEFAULT_DEPTH moves
+   # ahead, and a k too big for a board makes the line invalid
+   out = io.StringIO()
+   BatchAnalyzer.run(iter(["X---------------\n", "X---O---X\n"]), out, 1, k=4)
+   lines = out.getvalue().splitlines()
+   score, moveIdx = Negamax().search(Board.fromString("X---------------", 4), Game.DEFAULT_DEPTH)
+   assert("X---------------\t%s\t%i\t-" % (score, moveIdx) == lines[0])
+   assert("X---O---X\tinvalid" == lines[1])
+
+   # Boards that can't come up in a game
+   out = io.StringIO()
+   lines = ["OO-------", "XXXX-----", "XXX-OOO--", "XXXOOO---", "OOOXX-XX-", "XXXOO----"]
+   BatchAnalyzer.run(iter(line + "\n" for line in lines), out, 1)
+   assert([line + "\tinvalid" for line in lines[:-1]] + ["XXXOO----\t-1\t0\tX"] == out.getvalue().splitlines())
+   print("success!")
+
+def testEngine():
+   solved = SolvedTable.load() or SolvedTable.solve()
+   engine = Engine(solved)
+   assert("readyok" == engine.command("isready"))
+
+   # 3x3 comes straight from the solved table
+   board = Board(3, 3).move('X', 1).move('O', 5).move('X', 9)
+   assert("ok" == engine.command("position " + board.asString()))
+   reply = engine.command("go").split()
+   assert(["bestmove", str(solved.getBestMoveIdx(board)), "score", "0", "depth", "6", "nodes", "0"] == reply)
+
+   # Depth-limited and timed searches agree with Negamax
+   board = Board(4, 4, 3).move('X', 6)
+   assert("ok" == engine.command("position " + board.asString() + " 3"))
+   score, moveIdx = Negamax().search(board, 2)
+   reply = engine.command("go depth 2").split()
+   assert(str(moveIdx) == reply[1] and abs(score - float(reply[3])) < Negamax.EPSILON)
+   reply = engine.command("go movetime 50").split()
+   assert(1 <= int(reply[5]) <= 15 and not board.isFilledByIdx(int(reply[1])))
+
+   # Game over, and bad commands leave the position alone
+   assert("ok" == engine.command("position XXX-OO---"))
+   assert("bestmove 0 score -1 depth 0 nodes 0" == engine.command("go"))
+   for line in ("position OO-------", "position XX", "position", "go depth", "go depth 0", "go movetime x", "bogus", ""):
+      assert(engine.command(line).startswith("error"))
+   assert(engine.command("go").startswith("bestmove 0"))
+
+   # The same squares with a different k don't reuse the search table
+   string = "XX--OO----------"
+   assert(Board.fromString(string, 3).zobristKey() != Board.fromString(string, 4).zobristKey())
+   engine.command("position %s 3" % string)
+   engine.command("go depth 3")
+   engine.command("position %s 4" % string)
+   fresh = Engine(solved)
+   fresh.command("position %s 4" % string)
+   assert(fresh.command("go depth 3").split()[:4] == engine.command("go depth 3").split()[:4])
+
+   stats = json.loads(engine.command("stats")[len("stats "):])
+   assert(7 == stats['queries'] and 1 == stats['solvedHits'] and 0 < stats['nodes'])
+
+   # Over streams, stopping at quit
+   out = io.StringIO()
+   Engine(solved).run(io.StringIO("position X--------\ngo\nquit\ngo\n"), out)
+   assert("ok\nbestmove 5 score 0 depth 8 nodes 0\n" == out.getvalue())
+   print("success!")
+
+def testGameLogAnalyzer():
+   solved = SolvedTable.load() or SolvedTable.solve()
+   analyzer = GameLogAnalyzer(solved)
+   assert([5, 1, 9] == GameLogAnalyzer.parseMoves("5 1 9") == GameLogAnalyzer.parseMoves("5,1,9") \
+      == GameLogAnalyzer.parseMoves("519"))
+
+   # O answering the center with an edge loses, and X then drawing throws the
+   # win away
+   assert(('C', [(2, 'O', 2, 'draw-loss', 1), (5, 'X', 3, 'win-draw', 4)]) \
+      == analyzer.replay([5, 2, 1, 9, 3, 7, 8, 4, 6]))
+   assert((None, []) == analyzer.replay([5, 1]))
+   for moves in ([5, 5], [0], [10], [1, 4, 2, 5, 3, 6]):
+      try:
+         analyzer.replay(moves)
+         assert(False)
+      except ValueError:
+         pass
+
+   # Agrees with replaying on boards and comparing solved values
+   rand = random.Random(0)
+   for _ in range(200):
+      board = Board(3, 3)
+      moves = []
+      expected = []
+      while board.getWinner() == None:
+         symbol = board.nextSymbol()
+         moveIdx = rand.choice([i for i in range(1, 10) if not board.isFilledByIdx(i)])
+         color = Game.SYMBOL_TO_SCORE[symbol]
+         before = solved.getScore(board) * color
+         bestIdx = solved.getBestMoveIdx(board)
+         board = board.move(symbol, moveIdx)
+         moves.append(moveIdx)
+         after = solved.getScore(board) * color
+         if after < before:
+            expected.append((len(moves), symbol, moveIdx, GameLogAnalyzer.KINDS[(before, after)], bestIdx))
+      assert((board.getWinner(), expected) == analyzer.replay(moves))
+
+   out = io.StringIO()
+   log = "# comment\n5 2 1 9 3 7 8 4 6\n\n5,1\n55\n"
+   summary = analyzer.run(io.StringIO(log), out)
+   lines = out.getvalue().splitlines()
+   assert("2\t5,2,1,9,3,7,8,4,6\tC\t2:O:2:draw-loss:1,5:X:3:win-draw:4" == lines[0])
+   assert("4\t5,1\t-\t-" == lines[1])
+   assert(lines[2].startswith("5\t55\tinvalid"))
+   assert(summary == json.loads(lines[3][len("# summary "):]))
+   assert(3 == summary['games'] and 1 == summary['invalid'] and 1 == summary['unfinished'] \
+      and 1 == summary['draws'] and 11 == summary['moves'] and 1 == summary['gamesWithMistakes'])
+   assert(1 == summary['mistakes']['draw-loss']['O'] and 1 == summary['mistakes']['win-draw']['X'])
+
+   # Memory doesn't grow with the length of the log
+   def manyGames(count):
+      for i in range(count):
+         yield "5 2 1 9 3 7 8 4 6\n" if i % 2 else "1 2 3 4 5 6 7\n"
+   tracemalloc.start()
+   start = time.perf_counter()
+   analyzer.run(manyGames(20000), io.StringIO(), True)
+   elapsed = time.perf_counter() - start
+   peak = tracemalloc.get_traced_memory()[1]
+   tracemalloc.stop()
+   print('20000 logged games in %.0f ms, peak %i KB' % (elapsed * 1000, peak // 1024))
+   assert(peak < 100 * 1024)
+   print("success!")
+
+def testPositionExporter():
+   solved = SolvedTable.load() or SolvedTable.solve()
+
+   # Moves to the end found by playing out the best moves from the board
+   def distance(board):
+      moves = 0
+      while board.getWinner() == None:
+         board = board.move(board.nextSymbol(), solved.getBestMoveIdx(board))
+         moves += 1
+      return moves
+
+   rows = list(PositionExporter.positions(solved))
+   assert(sum(1 for entry in solved._data[:] if entry != SolvedTable.UNKNOWN) == len(rows))
+   assert((0, -1, 0, solved.getBestMoveIdx(Board(3, 3)), 9) == rows[0])
+   for code, toMove, value, bestMove, depth in rows:
+      string = "".join("-XO"[digit] for digit in PositionExporter._digits(code, 9))
+      board = Board.fromString(string)
+      assert(code == board.asInt())
+      assert(Game.SYMBOL_TO_SCORE[board.nextSymbol()] == toMove)
+      assert((solved.getScore(board), solved.getBestMoveIdx(board)) == (value, bestMove))
+      assert(distance(board) == depth)
+
+   with tempfile.TemporaryDirectory() as directory:
+      assert(len(rows) == PositionExporter.run(directory, solved=solved))
+      for i, name in enumerate(PositionExporter.COLUMNS):
+         with open(os.path.join(directory, name + '.npy'), 'rb') as f:
+            data = f.read()
+         headerSize = PositionExporter.HEADER_SIZE
+         assert(data.startswith(b"\x93NUMPY") and b"\n" == data[headerSize - 1:headerSize])
+         assert(("'shape': (%i,)" % len(rows)).encode() in data[:headerSize])
+         column = array.array(PositionExporter.TYPES[i][0], data[headerSize:])
+         assert([row[i] for row in rows] == list(column))
+      try:
+         import numpy
+         values = numpy.load(os.path.join(directory, 'value.npy'), mmap_mode='r')
+         assert([row[2] for row in rows] == values.tolist())
+      except ImportError:
+         pass
+
+   out = io.StringIO()
+   PositionExporter.run("-", True, solved, out)
+   lines = out.getvalue().splitlines()
+   assert("code,toMove,value,bestMove,depth" == lines[0] and len(rows) + 1 == len(lines))
+   assert(",".join(map(str, rows[-1])) == lines[-1])
+   print("success!")
+
+def testGameServer():
+   server = GameServer(SolvedTable.solve())
+   board = Board(3, 3)
+   board, reply = server.command(board, "move 5")
+   assert("ok O---X---- 1 -" == reply)
+   assert("O---X----" == board.asString())
+   for bad in ("move 5", "move 10", "move", "jump 1", ""):
+      same, reply = server.command(board, bad)
+      assert(same is board and reply.startswith("error"))
+
+   numGames = 200
+   async def play(port, seed):
+      rand = random.Random(seed)
+      reader, writer = await asyncio.open_connection("127.0.0.1", port)
+      assert(b"ok ready\n" == await reader.readline())
+      winner = "-"
+      while winner == "-":
+         writer.write(b"board\n")
+         _, string, _, _ = (await reader.readline()).decode().split()
+         moveIdx = rand.choice([i + 1 for i in range(9) if string[i] == "-"])
+         writer.write(b"move %i\n" % moveIdx)
+         _, _, _, winner = (await reader.readline()).decode().split()
+      writer.write(b"quit\n")
+      writer.close()
+      return winner
+
+   async def run():
+      tcpServer = await server.start("127.0.0.1:0")
+      port = tcpServer.sockets[0].getsockname()[1]
+      async with tcpServer:
+         start = time.perf_counter()
+         winners = await asyncio.gather(*[play(port, seed) for seed in range(numGames)])
+         elapsed = time.perf_counter() - start
+      return winners, elapsed
+
+   winners, elapsed = asyncio.run(run())
+   print('%i concurrent games in %.0f ms' % (numGames, elapsed * 1000))
+   assert(numGames == len(winners))
+   assert("X" not in winners)
+   assert(0 == server.sessions)
+   print("success!")
+
+def sharedTableBestMoves(handle, strings):
+   table = SolvedTable.attach(handle)
+   try:
+      return [table.getBestMoveIdx(Board.fromString(s)) for s in strings], \
+         isinstance(table._data, memoryview)
+   finally:
+      table.close()
+
+def testSharedSolvedTable():
+   solved = SolvedTable.solve()
+   strings = ["---------", "X--------", "X---O---X", "XO--X----"]
+   expected = [solved.getBestMoveIdx(Board.fromString(s)) for s in strings]
+
+   # A table built in memory is published through shared memory
+   handle, shm = solved.share()
+   try:
+      assert('shm' == handle[0])
+      with multiprocessing.Pool(2) as pool:
+         results = pool.starmap(sharedTableBestMoves, [(handle, strings)] * 4)
+      for moves, zeroCopy in results:
+         assert(expected == moves)
+         assert(zeroCopy)
+   finally:
+      shm.close()
+      shm.unlink()
+
+   # A table mapped from a file is shared by mapping the same file
+   loaded = SolvedTable.load()
+   handle, shm = loaded.share()
+   assert(('file', SolvedTable.DEFAULT_PATH) == handle and shm == None)
+   assert(expected == sharedTableBestMoves(handle, strings)[0])
+   loaded.close()
+   print("success!")
+
+def testTreeStore():
+   solved = SolvedTable.solve()
+   store = TreeStore(Board(3, 3))
+   # Every reachable position, once
+   assert(sum(1 for entry in solved._data if entry != SolvedTable.UNKNOWN) == len(store))
+   for i in range(len(store)):
+      board = Board.fromInt(store.codes[i])
+      assert(store.codes[i] == board.asInt())
+      assert(solved.getScore(board) == store.values[i])
+
+   handle = store.handle()
+   assert(0 == handle.value)
+   assert(solved.getBestMoveIdx(Board(3, 3)) == handle.getBestMoveIdx())
+   child = handle.getChild(5).getChild(1)
+   assert(Board(3, 3).move('X', 5).move('O', 1) == child.board)
+   assert(-1 == child.turn)
+   assert(not hasattr(child, '__dict__'))
+
+   # Compare with a tree of Node objects for the same positions
+   tracemalloc.start()
+   table = TranspositionTable()
+   root = Node(Board(3, 3), -1, table)
+   table.checkMatchAndAdd(root._board, root)
+   for child in root.expand():
+      child.genTree()
+   nodeBytes = tracemalloc.get_traced_memory()[0] / len(table)
+   tracemalloc.stop()
+   print('Bytes per node: Node objects %.0f, TreeStore %.1f' % (nodeBytes, store.bytesPerNode()))
+   assert(store.bytesPerNode() * 10 < nodeBytes)
+
+   # Depth-limited trees for bigger boards
+   store = TreeStore(Board(4, 4, 3).move('X', 6), depth=2)
+   assert(1 + 15 + 15 * 14 == len(store))
+   assert(Game.MIN_SCORE < store.handle().value < Game.MAX_SCORE)
+   print("success!")
+
+def testLazyExpansion():
+   results = {}
+   for lazy in (False, True):
+      tracemalloc.start()
+      start = time.perf_counter()
+      table = TranspositionTable()
+      board = Board(3, 3).move('X', 1)
+      root = Node(board, 1, table)
+      table.checkMatchAndAdd(board, root)
+      if not lazy:
+         root.genTree()
+      moveIdx = root.getBestMoveIdx()
+      elapsed = time.perf_counter() - start
+      _, peak = tracemalloc.get_traced_memory()
+      tracemalloc.stop()
+      results[lazy] = (moveIdx, len(table), elapsed, peak)
+      print(('Lazy' if lazy else 'Eager') + ': %i nodes, %.1f ms, %.0f KiB peak' % \
+         (len(table), elapsed * 1000, peak / 1024))
+
+   assert(results[False][0] == results[True][0])
+   assert(results[True][1] < results[False][1])
+
+   # Looking up a child works even if the node was never expanded
+   table = TranspositionTable()
+   board = Board(3, 3).move('X', 5)
+   root = Node(board, 1, table)
+   table.checkMatchAndAdd(board, root)
+   assert(not root._expanded)
+   child = root.getChildNodeByBoard(board.move('O', 1))
+   assert(board.move('O', 1) == child._board)
+   assert(not child._expanded)
+   print("success!")
+
+def iterTree(node, pre, post):
+   if pre: pre(node)
+   for child in node.children.values():
+      iterTree(child)
+   if post: post(node)
+
+
+def testGetByCoord():
+   board = Board(3, 3)
+   board = board.move("O", 7)
+   assert("O" == board.getByCoord(0, 0))
+
+   board = board.move("X", 2)
+   assert("X" == board.getByCoord(1, 2))
+   print("success!")
+
+def testBoardInit():
+   board = Board(3, 3)
+   assert(3 == board.width)
+   assert(3 == board.height)
+   assert(0 == board._xMask)
+   assert(0 == board._oMask)
+   print("success!")
+
+
+def testMove():
+   board = Board(3, 3)
+
+   board = board.move("X", 4)
+   assert("X" == board.getByIdx(4))
+
+   board = board.move("O", 1)
+   assert("O" == board.getByIdx(1))
+
+   board = board.move("X", 9)
+   assert("X" == board.getByIdx(9))
+
+   print("success!")
+
+
+
+def testIdxToY():
+   assert(2 == Board.idxToY(1))
+   assert(2 == Board.idxToY(2))
+   assert(2 == Board.idxToY(3))
+   assert(1 == Board.idxToY(4))
+   assert(1 == Board.idxToY(5))
+   assert(1 == Board.idxToY(6))
+   assert(0 == Board.idxToY(7))
+   assert(0 == Board.idxToY(8))
+   assert(0 == Board.idxToY(9))
+   print("success!")
+
+def testIdxToX():
+   assert(0 == Board.idxToX(1))
+   assert(1 == Board.idxToX(2))
+   assert(2 == Board.idxToX(3))
+   assert(0 == Board.idxToX(4))
+   assert(1 == Board.idxToX(5))
+   assert(2 == Board.idxToX(6))
+   assert(0 == Board.idxToX(7))
+   assert(1 == Board.idxToX(8))
+   assert(2 == Board.idxToX(9))
+   print("success!")
+
+def testCoordToIdx():
+   assert(7 == Board.coordToIdx(0, 0))
+   assert(8 == Board.coordToIdx(1, 0))
+   assert(9 == Board.coordToIdx(2, 0))
+   assert(4 == Board.coordToIdx(0, 1))
+   assert(5 == Board.coordToIdx(1, 1))
+   assert(6 == Board.coordToIdx(2, 1))
+   assert(1 == Board.coordToIdx(0, 2))
+   assert(2 == Board.coordToIdx(1, 2))
+   assert(3 == Board.coordToIdx(2, 2))
+   print("success!")
+
+def testIdxCoordsLargeBoard():
+   for width in (3, 4, 7):
+      for idx in range(1, width * width + 1):
+         x = Board.idxToX(idx, width)
+         y = Board.idxToY(idx, width)
+         assert(0 <= x < width and 0 <= y < width)
+         assert(idx == Board.coordToIdx(x, y, width))
+   # Keypad layout: 1 is bottom left, width * width is top right
+   assert((0, 3) == (Board.idxToX(1, 4), Board.idxToY(1, 4)))
+   assert((3, 0) == (Board.idxToX(16, 4), Board.idxToY(16, 4)))
+   print("success!")
+
+def testBoardPrint():
+   b = Board(3, 3)
+   print(b)
+   b = b.move('X', 3);
+   print(b)
+   b = b.move('O', 5);
+   print(b)
+   b = b.move('X', 9);
+   print(b)
+   b = b.move('O', 4);
+   print(b)
+   b = b.move('X', 1);
+   print(b)
+
+def testGetWinnerVert():
+   b = Board(3, 3)
+   b = b.move('X', 7)
+   b = b.move('O', 4)
+   b = b.move('X', 1)
+   assert(None == b.getWinner())
+   b = b.move('X', 9)
+   assert(None == b.getWinner())
+   b = b.move('O', 8)
+   assert(None == b.getWinner())
+   b = b.move('O', 5)
+   assert(None == b.getWinner())
+   b = b.move('O', 2)
+   assert('O' == b.getWinner())
+   print("success!")
+
+def testGetWinnerHoriz():
+   b = Board(3, 3)
+   b = b.move('X', 7)
+   b = b.move('O', 4)
+   b = b.move('X', 1)
+   assert(None == b.getWinner())
+   b = b.move('X', 9)
+   assert(None == b.getWinner())
+   b = b.move('O', 2)
+   assert(None == b.getWinner())
+   b = b.move('O', 5)
+   assert(None == b.getWinner())
+   b = b.move('X', 8)
+   assert('X' == b.getWinner())
+   print("success!")
+
+def testGetWinnerDiagBS():
+   b = Board(3, 3)
+   b = b.move('O', 7)
+   b = b.move('O', 4)
+   b = b.move('X', 1)
+   assert(None == b.getWinner())
+   b = b.move('X', 9)
+   assert(None == b.getWinner())
+   b = b.move('O', 2)
+   assert(None == b.getWinner())
+   b = b.move('O', 5)
+   assert(None == b.getWinner())
+   b = b.move('O', 3)
+   assert('O' == b.getWinner())
+   print("success!")
+
+def testGetWinnerDiagFS():
+   b = Board(3, 3)
+   b = b.move('O', 7)
+   b = b.move('O', 4)
+   b = b.move('X', 1)
+   assert(None == b.getWinner())
+   b = b.move('X', 9)
+   assert(None == b.getWinner())
+   b = b.move('O', 2)
+   assert(None == b.getWinner())
+   b = b.move('X', 5)
+   assert('X' == b.getWinner())
+   print("success!")
+
+def testGetWinnerCats():
+   b = Board(3, 3)
+   b = b.move('O', 7)
+   assert(None == b.getWinner())
+   b = b.move('X', 4)
+   assert(None == b.getWinner())
+   b = b.move('X', 1)
+   assert(None == b.getWinner())
+   b = b.move('X', 9)
+   assert(None == b.getWinner())
+   b = b.move('O', 2)
+   assert(None == b.getWinner())
+   b = b.move('O', 5)
+   assert(None == b.getWinner())
+   b = b.move('O', 6)
+   assert(None == b.getWinner())
+   b = b.move('X', 8)
+   assert(None == b.getWinner())
+   b = b.move('X', 3)
+   assert('C' == b.getWinner())
+   print('success!')
+
+def testGetWinnerKInARow():
+   assert(10 == len(Board.getLineMasks(4)))
+   assert(24 == len(Board.getLineMasks(4, 3)))
+
+   b = Board(4, 4, 3)
+   b = b.move('X', 6).move('X', 11)
+   assert(None == b.getWinner())
+   b = b.move('X', 16)
+   assert('X' == b.getWinner())
+
+   b = Board(7, 7, 5)
+   for idx in (10, 11, 12, 13):
+      b = b.move('O', idx)
+   assert(None == b.getWinner())
+   b = b.move('O', 14)
+   assert('O' == b.getWinner())
+   print("success!")
+
+def testLineCounters():
+   b0 = Board(3, 3)
+   b1 = b0.move('X', 5)
+   # The center is on both diagonals, the middle row and the middle column
+   assert(4 == sum(b1._xCounts))
+   assert(0 == sum(b0._xCounts))
+   assert(1 == b1.numFilled())
+
+   b2 = b1.move('O', 1).move('X', 3).move('O', 9).move('X', 7)
+   assert('X' == b2.getWinner())
+   assert(3 == max(b2._xCounts))
+
+   # Counters rebuilt from the bitboards match the incremental ones
+   b3 = b2._copy()
+   b3._recount()
+   assert(b2._xCounts == b3._xCounts and b2._oCounts == b3._oCounts)
+   assert('X' == b3.getWinner())
+   # A corner is on one run each along its row, column and diagonal
+   assert(3 == len(Board.getSquareLines(7, 5)[0]))
+   print("success!")
+
+def testEvaluator():
+   evaluator = Evaluator()
+   b = Board(7, 7, 5)
+   assert(0 == evaluator.evaluate(b))
+   # A piece in the corner is on fewer lines than one in the middle
+   corner = evaluator.evaluate(b.move('O', 1))
+   middle = evaluator.evaluate(b.move('O', 25))
+   assert(0 < corner < middle < Game.MAX_SCORE)
+   assert(-middle == evaluator.evaluate(b.move('X', 25)))
+   print("success!")
+
+def testDepthLimitedSearch():
+   # O takes the open win on 7x7, five in a row
+   b = Board(7, 7, 5)
+   for idx in (22, 23, 24, 25):
+      b = b.move('O', idx)
+   for idx in (1, 9, 17, 33):
+      b = b.move('X', idx)
+   root = Node(b, 1, TranspositionTable(7, 7))
+   assert(root.getBestMoveIdx(depth=1) in (21, 26))
+
+   # O blocks X's three in a row on 4x4, k=3
+   b = Board(4, 4, 3).move('X', 5).move('O', 1).move('X', 6)
+   root = Node(b, 1, TranspositionTable(4, 4))
+   score, _ = root.getBestMove(depth=2)
+   assert(Game.MIN_SCORE < score < Game.MAX_SCORE)
+   assert(7 == root.getBestMoveIdx(depth=2))
+
+   # A full depth search still agrees with the solved table
+   b = Board(3, 3).move('X', 1)
+   root = Node(b, 1, TranspositionTable())
+   assert(root.getBestMoveIdx(depth=9) == SolvedTable.solve().getBestMoveIdx(b))
+   print("success!")
+
+def testLogger(count=None):
+   print('testing')
+   if count == None:
+      print('testing2')
+      count = 0
+      MyLogger.debug("This is a test #%i, '%s'", count, str(count))
+      testLogger(count)
+      MyLogger.debug("And back up...")
+   elif count < 6:
+      print('testing2')
+      count += 1
+      MyLogger.debug("This is a test #%i, '%s'", count, str(count))
+      testLogger(count)
+      MyLogger.debug("And back up...")
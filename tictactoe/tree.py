@@ -0,0 +1,339 @@
+from array import array
+import time
+
+from .board import Board
+from .game import Game
+from .search import Evaluator
+from .stats import SearchStats
+
+class Node:
+   __slots__ = ('_board', '_turn', 'children', '_expanded', '_table')
+
+   count = 0
+   num = 0
+   depth = 0
+   # Number of nodes genTree has created at each depth
+   levelCount = {}
+
+   def __init__(self, board, turn, table):
+      self._board = board
+
+      # We are reusing nodes, but it's okay to store turn here because the board
+      # configuration will always guarantee the same turn even if the path to it
+      # is different
+
+      # The turn of the next move
+      # turn==1 when max's (computer's) turn
+      # turn==-1 when min's (user's) turn
+      self._turn = turn
+      # Child nodes by the keypad index of the move leading to them, in this
+      # node's board orientation
+      self.children = {}
+      # Children are only generated once something asks for them
+      self._expanded = False
+      self._table = table
+
+   def __eq__(self, other):
+      return other != None and self._board == other._board and self._turn == other._turn
+
+   def __ne__(self, other):
+      return not self.__eq__(other)
+
+   def isFinished(self):
+      return self._board.getWinner() == None
+
+   def getBestMoveIdx(self, depth=None, evaluator=None, parallel=None, cache=None):
+      return self.getBestMove(depth=depth, evaluator=evaluator, parallel=parallel, cache=cache)[1]
+
+
+   # With a depth, the search looks that many moves ahead and scores the
+   # positions it stops at with the evaluator instead of playing them out.
+   # With a ParallelSearch, the search is split across its workers instead of
+   # walking this tree, and uses the ParallelSearch's evaluator.
+   # Returns the score and the keypad index of the best move, or 0 if the game
+   # is over. With a PositionCache, results searched at least as deep by an
+   # earlier run are returned straight away, and new results are added to it.
+   def getBestMove(self, minBound=-999999, maxBound=999999, depth=None, evaluator=None, parallel=None, \
+         cache=None):
+      if cache != None:
+         entry = cache.get(self._board, depth)
+         if entry != None:
+            return entry[0], entry[2]
+         score, moveIdx = self.getBestMove(minBound, maxBound, depth, evaluator, parallel)
+         # A narrower window than the default only gives a bound
+         if minBound == -999999 and maxBound == 999999:
+            cache.put(self._board, score, depth, moveIdx)
+         return score, moveIdx
+
+      if parallel != None:
+         return parallel.search(self._board, depth)
+
+      if depth != None and evaluator == None:
+         evaluator = Evaluator()
+
+      stats = SearchStats.active
+      if stats is not None:
+         startTime = time.perf_counter()
+
+      if self._turn == 1:
+         score, moveIdx = self.getBestMoveScoreMax(minBound, maxBound, depth, evaluator)
+      elif self._turn == -1:
+         score, moveIdx = self.getBestMoveScoreMin(minBound, maxBound, depth, evaluator)
+      else:
+         raise Exception
+
+      if stats is not None:
+         stats.search(time.perf_counter() - startTime)
+      return score, moveIdx
+
+   def getBestMoveScoreMin(self, minBound=-999999, maxBound=999999, depth=None, evaluator=None):
+      stats = SearchStats.active
+      if stats is not None:
+         stats.visit(self._board.numFilled())
+
+      winner = self._board.getWinner()
+      if winner != None:
+         return Game.SYMBOL_TO_SCORE[winner], 0
+
+      if depth == 0:
+         return (evaluator or Evaluator()).evaluate(self._board), 0
+
+      if not self._expanded:
+         self.expand()
+
+      score = 999999
+      bestIdx = 0
+      for idx, child in self.children.items():
+         result,_ = child.getBestMoveScoreMax(minBound, maxBound, \
+            None if depth == None else depth - 1, evaluator)
+
+         if (score > result):
+            score = result
+            bestIdx = idx
+
+         if score <= minBound:
+            if stats is not None:
+               stats.cutoffs += 1
+            return score, bestIdx
+         maxBound = min(maxBound, score)
+      return score, bestIdx
+
+
+   def getBestMoveScoreMax(self, minBound=-999999, maxBound=999999, depth=None, evaluator=None):
+      stats = SearchStats.active
+      if stats is not None:
+         stats.visit(self._board.numFilled())
+
+      winner = self._board.getWinner()
+      if winner != None:
+         return Game.SYMBOL_TO_SCORE[winner], 0
+
+      if depth == 0:
+         return (evaluator or Evaluator()).evaluate(self._board), 0
+
+      if not self._expanded:
+         self.expand()
+
+      score = -999999
+      bestIdx = 0
+      for idx, child in self.children.items():
+         result,_ = child.getBestMoveScoreMin(minBound, maxBound, \
+            None if depth == None else depth - 1, evaluator)
+         if score < result:
+            score = result
+            bestIdx = idx
+
+         if score >= maxBound:
+            if stats is not None:
+               stats.cutoffs += 1
+            return score, bestIdx
+         minBound = max(minBound, score)
+      return score, bestIdx
+
+
+
+   # Returns the child reached by playing moveIdx (in this node's orientation)
+   def getChild(self, moveIdx):
+      if not self._expanded:
+         self.expand()
+      return self.children[moveIdx]
+
+   def getChildNodeByBoard(self, board):
+      if not self._expanded:
+         self.expand()
+
+      if self._table.symmetric:
+         # The child may be stored as a rotation/reflection of board, but the
+         # table finds it either way
+         node = self._table.get(board)
+         for child in self.children.values():
+            if child is node:
+               return child
+      else:
+         # The move is the square filled on board but not on this node's board
+         moveIdx = ((board._xMask | board._oMask) & ~(self._board._xMask | self._board._oMask)).bit_length()
+         child = self.children.get(moveIdx)
+         if child is not None and child._board == board:
+            return child
+      raise Exception("Not a child board: (" + self._board.asString() + ", " + board.asString() + ")")
+
+   # Generate this node's children, reusing nodes already in the table.
+   # Returns the children that didn't exist before.
+   def expand(self):
+      if self._expanded:
+         return []
+      self._expanded = True
+
+      newChildren = []
+      moveIter = self._board.makeMoves(Game.SCORE_TO_SYMBOL[self._turn])
+      for idx, b in moveIter:
+         newChild = Node(b, -1 * self._turn, self._table)
+
+         # Check for duplicates and reuse subtrees if possible
+         # The node we get back will be the same node or a new one, depending
+         # on if the tree already has that board configuration.
+         child = self._table.checkMatchAndAdd(b, newChild)
+         self.children[idx] = child
+         if child is newChild:
+            newChildren.append(child)
+      return newChildren
+
+   # Create the whole Minimax tree up front. The search doesn't need this, since
+   # it expands nodes as it visits them, but it's kept to compare against.
+   def genTree(self):
+      Node.count += 1
+      Node.depth += 1
+      Node.levelCount[Node.depth] = Node.levelCount.get(Node.depth, 0) + 1
+
+      # Only need to generate subtrees for new nodes
+      for child in self.expand():
+         Node.num += 1
+         child.genTree()
+      Node.count -= 1
+      Node.depth -= 1
+
+# A whole game tree packed into parallel arrays instead of Node objects. Node i
+# is the position codes[i] (Board.asInt) with turns[i] to move (1 for O, -1 for
+# X like Node) and minimax score values[i]. Its children are
+# children[childStart[i]:childStart[i + 1]], reached by playing the keypad
+# indices in the same slots of moves. Positions reached by different move
+# orders are stored once. Node indices are handed out breadth first, so every
+# child comes after its parent. Use handle() to walk the tree.
+class TreeStore:
+   # Codes are stored as unsigned 64 bit ints
+   MAX_SQUARES = 40
+
+   # Builds the tree below board, to the end of the game or, with a depth, that
+   # many moves deep with the evaluator scoring the positions where it stops
+   def __init__(self, board, depth=None, evaluator=None):
+      numSquares = board.width * board.height
+      assert(numSquares <= TreeStore.MAX_SQUARES)
+      self.width = board.width
+      self.k = board.k
+      self.codes = array('Q')
+      self.turns = array('b')
+      self.values = array('f')
+      self.childStart = array('I')
+      self.children = array('I')
+      self.moves = array('B')
+
+      evaluator = evaluator or Evaluator()
+      # Only needed while building
+      indices = {}
+      boards = []
+      depths = array('B')
+
+      def add(b, d):
+         code = b.asInt()
+         idx = indices.get(code)
+         if idx == None:
+            idx = len(self.codes)
+            indices[code] = idx
+            self.codes.append(code)
+            self.turns.append(Game.SYMBOL_TO_SCORE[b.nextSymbol()])
+            self.values.append(0)
+            boards.append(b)
+            depths.append(d)
+         return idx
+
+      add(board, 0)
+      i = 0
+      while i < len(self.codes):
+         self.childStart.append(len(self.children))
+         b = boards[i]
+         boards[i] = None
+         if b.getWinner() == None and (depth == None or depths[i] < depth):
+            symbol = Game.SCORE_TO_SYMBOL[self.turns[i]]
+            for idx in range(1, numSquares + 1):
+               if not b.isFilledByIdx(idx):
+                  self.children.append(add(b.move(symbol, idx), depths[i] + 1))
+                  self.moves.append(idx)
+         if self.childStart[i] == len(self.children):
+            winner = b.getWinner()
+            self.values[i] = evaluator.evaluate(b) if winner == None else Game.SYMBOL_TO_SCORE[winner]
+         i += 1
+      self.childStart.append(len(self.children))
+
+      # Children always come after their parents, so one backwards pass
+      # fills in every minimax value
+      for i in range(len(self.codes) - 1, -1, -1):
+         start = self.childStart[i]
+         end = self.childStart[i + 1]
+         if start < end:
+            childValues = [self.values[self.children[j]] for j in range(start, end)]
+            self.values[i] = max(childValues) if self.turns[i] == 1 else min(childValues)
+
+   def __len__(self):
+      return len(self.codes)
+
+   def handle(self, index=0):
+      return TreeHandle(self, index)
+
+   def bytesPerNode(self):
+      columns = (self.codes, self.turns, self.values, self.childStart, self.children, self.moves)
+      return sum(column.itemsize * len(column) for column in columns) / len(self)
+
+# Lightweight view of one node in a TreeStore
+class TreeHandle:
+   __slots__ = ('_store', 'index')
+
+   def __init__(self, store, index):
+      self._store = store
+      self.index = index
+
+   def __eq__(self, other):
+      return other != None and self._store is other._store and self.index == other.index
+
+   def __ne__(self, other):
+      return not self.__eq__(other)
+
+   @property
+   def board(self):
+      return Board.fromInt(self._store.codes[self.index], self._store.width, self._store.k)
+
+   @property
+   def turn(self):
+      return self._store.turns[self.index]
+
+   @property
+   def value(self):
+      return self._store.values[self.index]
+
+   # Yields (move index, child handle) pairs
+   def children(self):
+      store = self._store
+      for j in range(store.childStart[self.index], store.childStart[self.index + 1]):
+         yield store.moves[j], TreeHandle(store, store.children[j])
+
+   def getChild(self, moveIdx):
+      for idx, child in self.children():
+         if idx == moveIdx:
+            return child
+      return None
+
+   # The first move reaching this node's minimax value, 0 if the game is over
+   def getBestMoveIdx(self):
+      for idx, child in self.children():
+         if child.value == self.value:
+            return idx
+      return 0
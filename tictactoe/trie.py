@@ -0,0 +1,48 @@
+from .log import MyLogger
+
+# This trie is used to check for and prevent duplicate subtrees in the minimax tree
+class TrieNode:
+   __slots__ = ('_symbol', '_children', 'node')
+
+   def __init__(self, symbol='='):
+      self._symbol = symbol
+      self._children = {}
+      # Node of minimax tree
+      self.node = None
+
+   def print(self):
+      MyLogger.debug("_symbol=%s", self._symbol)
+      if self.node == None:
+         MyLogger.debug("node=None")
+      else:
+         MyLogger.debug("node._board=%s", self.node._board.asString())
+      MyLogger.debug("Iterating through _children:")
+      for child in self._children:
+         child.print()
+
+   # Check if there is a minmax tree node for this board string. If there is, return it.
+   # If there isn't, create a new trie node attached to the passed in minimax node and
+   # return the passed in minimax node
+   def checkMatchAndAdd(self, string, newNode):
+
+      MyLogger.debug("Checking %s vs %s", self._symbol, string[0])
+      if len(string) == 1:
+         if self._symbol == string:
+            if self.node == None:
+               self.node = newNode
+            return self.node
+         else:
+            raise Exception
+      else:
+         if string[0] == self._symbol:
+            child = self._children.get(string[1])
+            if child == None:
+               child = TrieNode(string[1])
+               self._children[string[1]] = child
+               MyLogger.debug("Creating new child trie node for symbol %s", string[1])
+               return child.checkMatchAndAdd(string[1:], newNode)
+            else:
+               MyLogger.debug("Found existing child trie node for symbol %s", string[1])
+               return child.checkMatchAndAdd(string[1:], newNode)
+         else:
+            raise Exception("trie node symbol " + self._symbol + " failed to match first char of " + string)
@@ -0,0 +1,210 @@
+from tictactoe import Board, Game, Node, TranspositionTable
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import random
+import time
+
+# Plays engine configurations against each other in bulk, for soak tests and
+# to check the engine is still as strong as it should be after a change. Games
+# are split into batches and spread over a process pool, and the results are
+# added up into win/draw/loss counts, games per second and time per move.
+#
+#    python tournament.py minimax random -n 10000
+#    python tournament.py depth:2 imperfect:0.1:2 -n 2000 --size 4 -k 3
+#
+# Player names:
+#    minimax                 search with Node.getBestMoveIdx, to the end on 3x3
+#                            and Game.DEFAULT_DEPTH moves ahead on bigger boards
+#    depth:N                 search N moves ahead with Node.getBestMoveIdx
+#    random                  picks a random empty square
+#    imperfect:RATE[:DEPTH]  minimax (or depth:DEPTH), except it plays a random
+#                            square RATE of the time
+# Each side plays X in half of the games.
+
+# Searches with Node trees. The table is kept between moves and games so
+# positions seen before don't need expanding again.
+class MinimaxPlayer:
+   # Drop the table once it holds this many nodes, for boards too big to keep
+   # every position
+   MAX_TABLE_SIZE = 200000
+
+   def __init__(self, depth=None):
+      self.depth = depth
+      self._table = None
+
+   def newGame(self, seed):
+      pass
+
+   def move(self, board):
+      if self._table == None or len(self._table) > MinimaxPlayer.MAX_TABLE_SIZE:
+         self._table = TranspositionTable(board.width, board.height)
+      node = self._table.get(board)
+      if node == None:
+         node = Node(board, Game.SYMBOL_TO_SCORE[board.nextSymbol()], self._table)
+         self._table.checkMatchAndAdd(board, node)
+      depth = self.depth
+      if depth == None and board.width > 3:
+         depth = Game.DEFAULT_DEPTH
+      return node.getBestMoveIdx(depth)
+
+class RandomPlayer:
+   def newGame(self, seed):
+      self._random = random.Random(seed)
+
+   def move(self, board):
+      return self._random.choice( \
+         [idx for idx in range(1, board.width * board.height + 1) if not board.isFilledByIdx(idx)])
+
+# Plays like MinimaxPlayer but makes a random move errorRate of the time
+class ImperfectPlayer:
+   def __init__(self, errorRate, depth=None):
+      self.errorRate = errorRate
+      self._minimax = MinimaxPlayer(depth)
+      self._randomPlayer = RandomPlayer()
+
+   def newGame(self, seed):
+      # Separate generators for when to err and which square to play
+      self._random = random.Random(seed)
+      self._randomPlayer.newGame(self._random.getrandbits(64))
+
+   def move(self, board):
+      if self._random.random() < self.errorRate:
+         return self._randomPlayer.move(board)
+      return self._minimax.move(board)
+
+def makePlayer(name):
+   kind, _, arg = name.partition(':')
+   if kind == 'minimax':
+      return MinimaxPlayer()
+   elif kind == 'depth':
+      return MinimaxPlayer(int(arg))
+   elif kind == 'random':
+      return RandomPlayer()
+   elif kind == 'imperfect':
+      rate, _, depth = arg.partition(':')
+      return ImperfectPlayer(float(rate), int(depth) if depth else None)
+   raise ValueError("Unknown player " + name)
+
+# Plays one game, returning the winner ('X', 'O' or 'C') and for each symbol
+# the number of moves made, the seconds spent making them and the seconds spent
+# on the slowest one
+def playGame(players, width, k):
+   board = Board(width, width, k)
+   moves = {'X': 0, 'O': 0}
+   seconds = {'X': 0.0, 'O': 0.0}
+   maxSeconds = {'X': 0.0, 'O': 0.0}
+   while board.getWinner() == None:
+      symbol = board.nextSymbol()
+      start = time.perf_counter()
+      moveIdx = players[symbol].move(board)
+      moveSeconds = time.perf_counter() - start
+      seconds[symbol] += moveSeconds
+      maxSeconds[symbol] = max(maxSeconds[symbol], moveSeconds)
+      moves[symbol] += 1
+      if moveIdx < 1 or board.isFilledByIdx(moveIdx):
+         raise Exception("Illegal move %i on %s" % (moveIdx, board.asString()))
+      board = board.move(symbol, moveIdx)
+   return board.getWinner(), moves, seconds, maxSeconds
+
+# Players are kept per worker process, so their tables last across batches
+_players = {}
+
+def getPlayer(name):
+   if name not in _players:
+      _players[name] = makePlayer(name)
+   return _players[name]
+
+def newResults():
+   return { \
+      'games': 0, 'wins': 0, 'draws': 0, 'losses': 0, \
+      'winsAsX': 0, 'winsAsO': 0, 'lossesAsX': 0, 'lossesAsO': 0, \
+      'moves': [0, 0], 'moveSeconds': [0.0, 0.0], 'maxMoveSeconds': [0.0, 0.0] \
+   }
+
+# Plays games first to first + count - 1 between players a and b, counting
+# results from a's side. a plays X in even numbered games. Each game's random
+# seed comes from its number, so results don't depend on how the games were
+# split into batches.
+def playBatch(a, b, width, k, seed, first, count):
+   results = newResults()
+   playerA = getPlayer(a)
+   playerB = getPlayer(b)
+   for game in range(first, first + count):
+      aIsX = game % 2 == 0
+      playerA.newGame((seed * 1000003 + game) * 2)
+      playerB.newGame((seed * 1000003 + game) * 2 + 1)
+      players = {'X': playerA, 'O': playerB} if aIsX else {'X': playerB, 'O': playerA}
+      aSymbol = 'X' if aIsX else 'O'
+      winner, moves, seconds, maxSeconds = playGame(players, width, k)
+
+      results['games'] += 1
+      if winner == 'C':
+         results['draws'] += 1
+      elif winner == aSymbol:
+         results['wins'] += 1
+         results['winsAs' + aSymbol] += 1
+      else:
+         results['losses'] += 1
+         results['lossesAs' + aSymbol] += 1
+      for i, symbol in enumerate((aSymbol, 'O' if aIsX else 'X')):
+         results['moves'][i] += moves[symbol]
+         results['moveSeconds'][i] += seconds[symbol]
+         results['maxMoveSeconds'][i] = max(results['maxMoveSeconds'][i], maxSeconds[symbol])
+   return results
+
+def addResults(total, results):
+   for key, value in results.items():
+      if key == 'maxMoveSeconds':
+         total[key] = [max(x, y) for x, y in zip(total[key], value)]
+      elif isinstance(value, list):
+         total[key] = [x + y for x, y in zip(total[key], value)]
+      else:
+         total[key] += value
+
+def run(a, b, games, width=3, k=None, seed=0, workers=None, batchSize=100):
+   total = newResults()
+   start = time.perf_counter()
+   batches = [(first, min(batchSize, games - first)) for first in range(0, games, batchSize)]
+   with ProcessPoolExecutor(workers) as pool:
+      futures = [pool.submit(playBatch, a, b, width, k, seed, first, count) for first, count in batches]
+      for future in futures:
+         addResults(total, future.result())
+   elapsed = time.perf_counter() - start
+
+   total['seconds'] = elapsed
+   total['gamesPerSecond'] = total['games'] / elapsed
+   total['meanMoveSeconds'] = [s / m if m else 0.0 for s, m in zip(total['moveSeconds'], total['moves'])]
+   return total
+
+def main():
+   parser = argparse.ArgumentParser(description="Self-play tournaments between engine configurations")
+   parser.add_argument("a", help="first player, e.g. minimax, depth:2, random, imperfect:0.1, imperfect:0.1:2")
+   parser.add_argument("b", help="second player")
+   parser.add_argument("-n", "--games", type=int, default=1000, help="number of games")
+   parser.add_argument("-j", "--workers", type=int, help="worker processes (one per core by default)")
+   parser.add_argument("--size", type=int, default=3, help="board width and height")
+   parser.add_argument("-k", type=int, help="number in a row needed to win")
+   parser.add_argument("--seed", type=int, default=0)
+   parser.add_argument("--json", action="store_true", help="print the results as JSON")
+   args = parser.parse_args()
+
+   # Check the player names before starting any workers
+   makePlayer(args.a)
+   makePlayer(args.b)
+
+   results = run(args.a, args.b, args.games, args.size, args.k, args.seed, args.workers)
+   if args.json:
+      print(json.dumps(results))
+      return
+
+   print('%s vs %s, %i games on %ix%i' % (args.a, args.b, results['games'], args.size, args.size))
+   print('  %s: %i wins (%i as X, %i as O), %i draws, %i losses' % (args.a, \
+      results['wins'], results['winsAsX'], results['winsAsO'], results['draws'], results['losses']))
+   print('  %.0f games/s over %.1f s' % (results['gamesPerSecond'], results['seconds']))
+   for i, name in enumerate((args.a, args.b)):
+      print('  %s: %.3f ms per move, slowest move %.3f ms' % (name, \
+         results['meanMoveSeconds'][i] * 1000, results['maxMoveSeconds'][i] * 1000))
+
+if __name__ == "__main__":
+   main()